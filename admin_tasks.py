@@ -0,0 +1,208 @@
+"""
+CPU-heavy admin operations, kept free of Flask so they can run either on
+the request thread or in a background job process (see jobs.py).
+
+The run_* functions are the job entry points: they take file paths
+rather than loaded data so that only small arguments cross the process
+boundary, and they return small JSON-serializable results.
+"""
+
+import csv
+import io
+from datetime import datetime, timedelta
+
+import archive
+import dedupe
+import storage
+
+
+def compute_rsvp_stats(rsvp_data, waitlist_data, guestbook_data):
+    """Compute the admin dashboard statistics"""
+    # Basic RSVP stats
+    attending = len([r for r in rsvp_data if r.get('attendance') == 'attending'])
+    declining = len([r for r in rsvp_data if r.get('attendance') == 'declining'])
+    total = len(rsvp_data)
+
+    # Calculate rates
+    attending_rate = f"{(attending / total * 100):.1f}%" if total > 0 else "0%"
+    declining_rate = f"{(declining / total * 100):.1f}%" if total > 0 else "0%"
+
+    # Recent activity (last 24 hours)
+    now = datetime.now()
+    yesterday = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    last_24h_rsvps = len([r for r in rsvp_data
+                         if datetime.fromisoformat(r['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > yesterday])
+
+    # Waitlist stats
+    waitlist_today = len([w for w in waitlist_data
+                         if datetime.fromisoformat(w['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > yesterday])
+
+    # Guestbook stats
+    guestbook_today = len([g for g in guestbook_data
+                          if datetime.fromisoformat(g['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > yesterday])
+
+    # This week stats
+    week_ago = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=7)
+    guestbook_week = len([g for g in guestbook_data
+                         if datetime.fromisoformat(g['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > week_ago])
+
+    # Song requests
+    song_requests = len([r for r in rsvp_data if r.get('song', '').strip()])
+
+    # Most active day
+    day_counts = {}
+    for r in rsvp_data:
+        date = datetime.fromisoformat(r['timestamp'].replace('Z', '+00:00')).strftime('%A')
+        day_counts[date] = day_counts.get(date, 0) + 1
+
+    most_active_day = max(day_counts.items(), key=lambda x: x[1])[0] if day_counts else 'N/A'
+
+    # Average response time (simplified - using submission time as proxy)
+    if rsvp_data:
+        # Calculate average time between submissions (as a proxy for response time)
+        timestamps = [datetime.fromisoformat(r['timestamp'].replace('Z', '+00:00')) for r in rsvp_data]
+        timestamps.sort()
+        if len(timestamps) > 1:
+            intervals = [(timestamps[i+1] - timestamps[i]).total_seconds() / 3600 for i in range(len(timestamps)-1)]
+            avg_interval = sum(intervals) / len(intervals)
+            avg_response_time = f"{avg_interval:.1f} hours"
+        else:
+            avg_response_time = "N/A"
+    else:
+        avg_response_time = "N/A"
+
+    return {
+        'total': total,
+        'attending': attending,
+        'declining': declining,
+        'pending': total - attending - declining,
+        'attendingRate': attending_rate,
+        'decliningRate': declining_rate,
+        'last24h': last_24h_rsvps,
+        'waitlistToday': waitlist_today,
+        'guestbookToday': guestbook_today,
+        'guestbookWeek': guestbook_week,
+        'songRequests': song_requests,
+        'mostActiveDay': most_active_day,
+        'avgResponseTime': avg_response_time
+    }
+
+
+def merge_rsvp_rows(existing_rsvps, rows, archived=()):
+    """Append imported RSVP rows to existing_rsvps, returning how many were added.
+
+    Rows matching an existing or archived RSVP are skipped.
+    """
+    imported_count = 0
+    existing_names = {dedupe.normalize_name(rsvp['name']) for rsvp in [*archived, *existing_rsvps]}
+
+    for row in rows:
+        # Validate required fields
+        if not row.get('name'):
+            continue
+
+        # Skip if name already exists, ignoring case, spacing and punctuation
+        name_key = dedupe.normalize_name(row['name'])
+        if name_key in existing_names:
+            continue
+
+        # Create RSVP entry
+        rsvp_entry = {
+            'id': datetime.now().strftime('%Y%m%d_%H%M%S_%f'),
+            'name': row['name'],
+            'attendance': row.get('attendance', 'not_specified'),
+            'song': row.get('song', ''),
+            'timestamp': datetime.now().isoformat(),
+            'ip_address': 'imported',
+            'imported': True
+        }
+
+        existing_rsvps.append(rsvp_entry)
+        existing_names.add(name_key)
+        imported_count += 1
+
+    return imported_count
+
+
+def merge_guest_rows(existing_guests, rows, archived=()):
+    """Append imported guest list rows to existing_guests, returning how many were added.
+
+    Rows matching an existing or archived guest book entry are skipped.
+    """
+    imported_count = 0
+    existing_names = {dedupe.normalize_name(guest['name']) for guest in [*archived, *existing_guests]}
+
+    for row in rows:
+        # Validate required fields
+        if not row.get('name'):
+            continue
+
+        # Skip if name already exists, ignoring case, spacing and punctuation
+        name_key = dedupe.normalize_name(row['name'])
+        if name_key in existing_names:
+            continue
+
+        # Create guest entry (as a guestbook message)
+        guest_entry = {
+            'id': datetime.now().strftime('%Y%m%d_%H%M%S_%f'),
+            'name': row['name'],
+            'relationship': row.get('category', 'Other'),
+            'message': f"Imported guest: {row.get('email', 'No email')} | {row.get('phone', 'No phone')}",
+            'timestamp': datetime.now().isoformat(),
+            'ip_address': 'imported',
+            'imported': True,
+            'email': row.get('email', ''),
+            'phone': row.get('phone', '')
+        }
+
+        existing_guests.append(guest_entry)
+        existing_names.add(name_key)
+        imported_count += 1
+
+    return imported_count
+
+
+def to_csv(entries, fields):
+    """Render entries as CSV with the given columns"""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    for entry in entries:
+        writer.writerow({field: entry.get(field, '') for field in fields})
+    return output.getvalue()
+
+
+def load_or_empty(filename):
+    """Load a data file, treating a missing or unreadable file as empty"""
+    try:
+        return storage.load_file(filename)
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def run_rsvp_stats(rsvp_file, waitlist_file, guestbook_file, archive_dir):
+    """Job entry point: recompute RSVP statistics, counting archived RSVPs"""
+    rsvp_data = archive.load_archived(archive_dir, 'rsvp') + load_or_empty(rsvp_file)
+    return compute_rsvp_stats(rsvp_data, load_or_empty(waitlist_file), load_or_empty(guestbook_file))
+
+
+def run_import(kind, filename, rows, archive_dir, fmt='json'):
+    """Job entry point: merge imported rows into a collection file"""
+    if kind == 'rsvp':
+        merge, archived = merge_rsvp_rows, archive.load_archived(archive_dir, 'rsvp')
+    else:
+        merge, archived = merge_guest_rows, archive.load_archived(archive_dir, 'guestbook')
+    with storage.file_lock(filename):
+        existing = load_or_empty(filename)
+        imported = merge(existing, rows, archived)
+        storage.save_file(filename, existing, fmt, fsync=True)
+    return {'imported': imported}
+
+
+def run_export(filename, fields, output_file):
+    """Job entry point: export a collection to a CSV file"""
+    entries = load_or_empty(filename)
+    with open(output_file, 'w', newline='') as f:
+        f.write(to_csv(entries, fields))
+    return {'rows': len(entries)}
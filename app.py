@@ -1,17 +1,35 @@
-from flask import Flask, request, jsonify, render_template_string, send_from_directory
+from flask import Flask, Request, request, jsonify, render_template_string, send_from_directory, g
 from flask_cors import CORS
 import json
 import os
-from datetime import datetime, timedelta
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from datetime import datetime
 from dotenv import load_dotenv
+from werkzeug.exceptions import RequestEntityTooLarge
+import storage
+import archive
+import backup
+import dedupe
+import admin_tasks
+import jobs
+import limits
+from snapshots import FileSnapshot, encode_json_body
+from group_commit import GroupCommitWriter
+from tenants import TenantRegistry, TenantPathMiddleware, tenant_id_from_host, DEFAULT_MAX_TENANTS
 
-# Load environment variables
-load_dotenv()
+# Importing this module only defines the app and its routes. Environment
+# loading and data file creation happen in create_app(), which wsgi.py calls
+# once in the gunicorn master when running with --preload.
+class ValidatedRequest(Request):
+    """Request whose JSON body may already have been parsed by limit_request_body()"""
+    validated_json = None
+    
+    def get_json(self, force=False, silent=False, cache=True):
+        if self.validated_json is not None:
+            return self.validated_json
+        return super().get_json(force=force, silent=silent, cache=cache)
 
 app = Flask(__name__, static_folder='.', static_url_path='')
+app.request_class = ValidatedRequest
 CORS(app)
 
 # Data storage files
@@ -20,27 +38,126 @@ RSVP_FILE = os.path.join(DATA_DIR, 'rsvp_data.json')
 WAITLIST_FILE = os.path.join(DATA_DIR, 'waitlist_data.json')
 GUESTBOOK_FILE = os.path.join(DATA_DIR, 'guestbook_data.json')
 SITE_CONFIG_FILE = os.path.join(DATA_DIR, 'site_config.json')
+BACKUP_DIR = 'backups'
+JOBS_DIR = 'jobs'
+
+# The files above belong to the default site. In multi-tenant mode every
+# other site gets the same layout under tenants/<tenant_id>/, and request
+# handlers use the paths of the tenant resolved for the request (g.tenant).
+tenant_registry = TenantRegistry('tenants', DATA_DIR, BACKUP_DIR, default_jobs_dir=JOBS_DIR)
+
+# How the tenant is resolved: off (single site), host or path (/t/<tenant>/)
+TENANT_POLICY = {'mode': 'off', 'baseDomain': None}
+
+# On-disk format per collection file name: json (compact) or msgpack.
+# Reads detect the format, so this can be changed without converting
+# files. Populated from the environment by load_config().
+DATA_FORMATS = {}
+
+# Default retention policy for POST /api/admin/archive; None means no limit
+ARCHIVE_POLICY = {'maxAgeDays': None, 'maxCount': None}
+
+# Number of backup snapshots kept by rotation
+BACKUP_POLICY = {'keep': backup.DEFAULT_KEEP}
+
+# Duplicate check on RSVP submission: off, warn (flag in the response)
+# or reject (409 when a similar name has already RSVPed)
+DUPLICATE_POLICY = {'check': 'off', 'threshold': dedupe.DEFAULT_THRESHOLD}
+
+# Request body limits; import routes get a larger body cap and a row limit
+REQUEST_LIMITS = {
+    'maxBody': limits.DEFAULT_MAX_BODY,
+    'maxImportBody': limits.DEFAULT_MAX_IMPORT_BODY,
+    'maxImportRows': limits.DEFAULT_MAX_IMPORT_ROWS,
+    'fields': dict(limits.DEFAULT_FIELD_LIMITS)
+}
+IMPORT_ENDPOINTS = ('import_rsvp_data', 'import_guest_data', 'submit_admin_job')
+
+# Columns of the CSV files written by export jobs, matching the admin page
+EXPORT_FIELDS = {
+    'rsvp': ['name', 'attendance', 'song', 'timestamp'],
+    'waitlist': ['name', 'attendance', 'song', 'timestamp'],
+    'guestbook': ['name', 'relationship', 'message', 'timestamp']
+}
+
+def load_config():
+    """Load environment variables and the per-collection data formats"""
+    load_dotenv()
+    default_format = os.getenv('DATA_FORMAT', 'json')
+    DATA_FORMATS.update({
+        os.path.basename(RSVP_FILE): os.getenv('RSVP_DATA_FORMAT', default_format),
+        os.path.basename(WAITLIST_FILE): os.getenv('WAITLIST_DATA_FORMAT', default_format),
+        os.path.basename(GUESTBOOK_FILE): os.getenv('GUESTBOOK_DATA_FORMAT', default_format),
+        os.path.basename(SITE_CONFIG_FILE): os.getenv('SITE_CONFIG_DATA_FORMAT', 'json')
+    })
+    for name, fmt in list(DATA_FORMATS.items()):
+        if fmt not in storage.available_formats():
+            print(f"Data format {fmt} is not available for {name}; using json")
+            DATA_FORMATS[name] = 'json'
+    ARCHIVE_POLICY.update({
+        'maxAgeDays': parse_optional_int(os.getenv('ARCHIVE_MAX_AGE_DAYS')),
+        'maxCount': parse_optional_int(os.getenv('ARCHIVE_MAX_COUNT'))
+    })
+    BACKUP_POLICY['keep'] = parse_optional_int(os.getenv('BACKUP_KEEP')) or backup.DEFAULT_KEEP
+    DUPLICATE_POLICY.update({
+        'check': os.getenv('RSVP_DUPLICATE_CHECK', 'off'),
+        'threshold': float(os.getenv('DUPLICATE_THRESHOLD', dedupe.DEFAULT_THRESHOLD))
+    })
+    TENANT_POLICY.update({
+        'mode': os.getenv('TENANT_MODE', 'off'),
+        'baseDomain': os.getenv('TENANT_BASE_DOMAIN') or None
+    })
+    tenant_registry.configure(
+        os.getenv('TENANTS_DIR', 'tenants'),
+        parse_optional_int(os.getenv('TENANT_CACHE_SIZE')) or DEFAULT_MAX_TENANTS
+    )
+    jobs.configure(
+        parse_optional_int(os.getenv('JOB_WORKERS')) or jobs.DEFAULT_MAX_WORKERS,
+        parse_optional_int(os.getenv('JOB_QUEUE_LIMIT')) or jobs.DEFAULT_MAX_PENDING
+    )
+    REQUEST_LIMITS.update({
+        'maxBody': parse_optional_int(os.getenv('MAX_BODY_BYTES')) or limits.DEFAULT_MAX_BODY,
+        'maxImportBody': parse_optional_int(os.getenv('MAX_IMPORT_BYTES')) or limits.DEFAULT_MAX_IMPORT_BODY,
+        'maxImportRows': parse_optional_int(os.getenv('MAX_IMPORT_ROWS')) or limits.DEFAULT_MAX_IMPORT_ROWS
+    })
+    for field in limits.DEFAULT_FIELD_LIMITS:
+        REQUEST_LIMITS['fields'][field] = (parse_optional_int(os.getenv(f'MAX_{field.upper()}_LENGTH'))
+                                           or limits.DEFAULT_FIELD_LIMITS[field])
+    # Hard cap enforced by Flask itself, e.g. on chunked bodies of any route
+    app.config['MAX_CONTENT_LENGTH'] = max(REQUEST_LIMITS['maxBody'], REQUEST_LIMITS['maxImportBody'])
+
+def parse_optional_int(value):
+    """Parse an optional integer setting, treating empty values as unset"""
+    if value is None or value == '':
+        return None
+    return int(value)
+
+def is_non_negative(value, types):
+    """Check a JSON value is a non-negative number of the given types (not a boolean)"""
+    return isinstance(value, types) and not isinstance(value, bool) and value >= 0
 
 # Ensure data files exist
-def ensure_data_files():
+def ensure_data_files(tenant=None):
+    tenant = tenant or tenant_registry.default
+    
     # Create data directory if it doesn't exist
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
+    if not os.path.exists(tenant.data_dir):
+        os.makedirs(tenant.data_dir)
     
-    if not os.path.exists(RSVP_FILE):
-        with open(RSVP_FILE, 'w') as f:
+    if not os.path.exists(tenant.rsvp_file):
+        with open(tenant.rsvp_file, 'w') as f:
             json.dump([], f)
     
-    if not os.path.exists(GUESTBOOK_FILE):
-        with open(GUESTBOOK_FILE, 'w') as f:
+    if not os.path.exists(tenant.guestbook_file):
+        with open(tenant.guestbook_file, 'w') as f:
             json.dump([], f)
     
-    if not os.path.exists(WAITLIST_FILE):
-        with open(WAITLIST_FILE, 'w') as f:
+    if not os.path.exists(tenant.waitlist_file):
+        with open(tenant.waitlist_file, 'w') as f:
             json.dump([], f)
     
-    if not os.path.exists(SITE_CONFIG_FILE):
-        with open(SITE_CONFIG_FILE, 'w') as f:
+    if not os.path.exists(tenant.site_config_file):
+        with open(tenant.site_config_file, 'w') as f:
             json.dump({
                 'showHotelInfo': True,
                 'hotelName': 'Hampton Inn & Suites Ft. Worth-Burleson',
@@ -48,26 +165,138 @@ def ensure_data_files():
                 'bookingLink': 'https://www.google.com/travel/search?ts=CAESCAoCCAMKAggDGhwSGhIUCgcI6Q8QARgeEgcI6Q8QARgfGAEyAhAAKgcKBToDVVNE&qs=CAEyFENnc0l0ZGlRamViNWhLTHRBUkFCOApCCREL08P7HO_8ikIJEQKS7AAeOhwDQgkRy6OAidTYq_NaUQgBMk2qAUoQASoKIgZob3RlbHMoADIfEAEiG4_fMcyX83ZMB4u11pHZG8IJuZmkvlGPnVOVDTIZEAIiFWhvdGVscyBpbiBidXJsZXNvbiB0eA&utm_campaign=sharing&utm_medium=link_btn&utm_source=htls'
             }, f)
 
-# Initialize data files when app starts
-ensure_data_files()
+# Initialize configuration and data files once per process
+_initialized = False
+
+def create_app():
+    """Load configuration and create the data files, once per process.
+
+    Under gunicorn --preload this runs in the master before workers fork,
+    so workers start with everything already initialized.
+    """
+    global _initialized
+    if not _initialized:
+        load_config()
+        ensure_data_files()
+        _initialized = True
+    return app
+
+@app.before_request
+def ensure_initialized():
+    """Initialize lazily when the app is served without create_app()"""
+    if not _initialized:
+        create_app()
+
+@app.before_request
+def limit_request_body():
+    """Reject oversized bodies, long fields and huge imports before a route parses them"""
+    if request.method not in ('POST', 'PUT'):
+        return None
+    
+    is_import = request.endpoint in IMPORT_ENDPOINTS
+    max_body = REQUEST_LIMITS['maxImportBody'] if is_import else REQUEST_LIMITS['maxBody']
+    try:
+        limits.check_content_length(request.content_length, max_body)
+        if request.is_json:
+            raw = limits.read_body(request.stream, max_body)
+            if raw:
+                max_rows = REQUEST_LIMITS['maxImportRows'] if is_import else None
+                request.validated_json = limits.parse_json(raw, REQUEST_LIMITS['fields'], max_rows)
+    except limits.PayloadRejected as e:
+        return jsonify({'error': str(e)}), e.status
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({'error': 'Request body too large'}), 413
+
+# Serve /t/<tenant>/... paths as that tenant's site in path mode
+app.wsgi_app = TenantPathMiddleware(app.wsgi_app, lambda: TENANT_POLICY['mode'] == 'path')
+
+@app.before_request
+def resolve_tenant():
+    """Select the site whose data this request reads and writes"""
+    tenant_id = None
+    if TENANT_POLICY['mode'] == 'host':
+        tenant_id = tenant_id_from_host(request.host, TENANT_POLICY['baseDomain'])
+    elif TENANT_POLICY['mode'] == 'path':
+        tenant_id = request.environ.get(TenantPathMiddleware.ENVIRON_KEY)
+    
+    g.tenant = tenant_registry.get(tenant_id)
+    if g.tenant is None:
+        return jsonify({'error': 'Site not found'}), 404
 
 # Load data from files
 def load_data(filename):
     try:
-        with open(filename, 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        return storage.load_file(filename)
+    except (FileNotFoundError, ValueError):
         return []
 
 # Save data to files
-def save_data(filename, data):
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
+def save_data(filename, data, fsync=False):
+    storage.save_file(filename, data, DATA_FORMATS.get(os.path.basename(filename), 'json'), fsync=fsync)
+
+# Save data and flush it to disk before returning
+def save_data_durable(filename, data):
+    save_data(filename, data, fsync=True)
+
+# Submissions arriving together are appended in one durable write per file
+def collection_writer(tenant, collection):
+    filename = tenant.collection_files[collection]
+    return tenant.cached(f'{collection}_writer',
+                         lambda: GroupCommitWriter(filename, load_data, save_data_durable))
+
+# Serve a pre-encoded body with an ETag
+def cached_response(body, etag):
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+# Site config is read on every public page load, so its response body is
+# encoded once per change and shared by all requests in this worker
+def site_config_snapshot(tenant):
+    return tenant.cached('site_config', lambda: FileSnapshot(
+        tenant.site_config_file,
+        load_data,
+        lambda config: encode_json_body({'success': True, 'config': config})
+    ))
+
+# Number of guestbook messages shown on the public page
+GUESTBOOK_PUBLIC_LIMIT = 20
+
+def build_guestbook_view(guestbook_data):
+    """Pre-encode the public guestbook JSON body"""
+    latest = guestbook_data[-GUESTBOOK_PUBLIC_LIMIT:]
+    return encode_json_body({'success': True, 'messages': latest})
+
+# The guestbook body is rebuilt only when the guestbook file changes
+def guestbook_snapshot(tenant):
+    return tenant.cached('guestbook', lambda: FileSnapshot(
+        tenant.guestbook_file, load_data, build_guestbook_view
+    ))
+
+# Name index of RSVPs for the submit-time duplicate check
+def rsvp_name_index(tenant):
+    return tenant.cached('rsvp_names', lambda: FileSnapshot(
+        tenant.rsvp_file, load_data,
+        lambda rsvps: dedupe.NameIndex(archived_entries(tenant, 'rsvp') + rsvps, 'rsvp')
+    ))
+
+# Archived entries of a collection, reread only after an archive run
+def archived_entries(tenant, collection):
+    return tenant.cached(f'{collection}_archive',
+                         lambda: archive.ArchivedEntries(tenant.archive_dir, collection)).get()
 
 # Email configuration
 def send_email_notification(subject, message, recipient_email=None):
     """Send email notification to the couple"""
     try:
+        # Imported here so the mail modules only load on the first send
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         # Get email credentials from environment variables
         sender_email = os.getenv('EMAIL_USER')
         sender_password = os.getenv('EMAIL_PASSWORD')
@@ -131,6 +360,17 @@ def submit_rsvp():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        # Optionally look for an RSVP already received under a similar name
+        duplicates = []
+        if DUPLICATE_POLICY['check'] in ('warn', 'reject'):
+            duplicates = rsvp_name_index(g.tenant).get().find_matches(data['name'], DUPLICATE_POLICY['threshold'])
+            if duplicates and DUPLICATE_POLICY['check'] == 'reject':
+                existing = duplicates[0][0]
+                return jsonify({
+                    'error': f"We already have an RSVP for {existing['name']}",
+                    'duplicate_of': existing['id']
+                }), 409
+        
         # Create RSVP entry
         rsvp_entry = {
             'id': datetime.now().strftime('%Y%m%d_%H%M%S'),
@@ -141,10 +381,8 @@ def submit_rsvp():
             'ip_address': request.remote_addr
         }
         
-        # Load existing data
-        rsvp_data = load_data(RSVP_FILE)
-        rsvp_data.append(rsvp_entry)
-        save_data(RSVP_FILE, rsvp_data)
+        # Append to the data file along with any concurrent submissions
+        collection_writer(g.tenant, 'rsvp').append(rsvp_entry)
         
         # Send email notification
         subject = "New RSVP Submission"
@@ -165,11 +403,14 @@ def submit_rsvp():
         else:
             response_message = f"Thank you for your RSVP, {rsvp_entry['name']}! We'll be in touch soon."
         
-        return jsonify({
+        response = {
             'success': True,
             'message': response_message,
             'rsvp_id': rsvp_entry['id']
-        })
+        }
+        if duplicates:
+            response['possible_duplicate_of'] = [match['id'] for match, score in duplicates]
+        return jsonify(response)
         
     except Exception as e:
         print(f"Error processing RSVP: {e}")
@@ -198,10 +439,9 @@ def submit_guestbook():
             'ip_address': request.remote_addr
         }
         
-        # Load existing data
-        guestbook_data = load_data(GUESTBOOK_FILE)
-        guestbook_data.append(guestbook_entry)
-        save_data(GUESTBOOK_FILE, guestbook_data)
+        # Append to the data file along with any concurrent submissions
+        collection_writer(g.tenant, 'guestbook').append(guestbook_entry)
+        guestbook_snapshot(g.tenant).invalidate()
         
         # Send email notification
         subject = "New Guest Book Message"
@@ -231,12 +471,8 @@ def submit_guestbook():
 def get_guestbook():
     """Retrieve guest book messages"""
     try:
-        guestbook_data = load_data(GUESTBOOK_FILE)
-        # Return only the last 20 messages to prevent overwhelming the frontend
-        return jsonify({
-            'success': True,
-            'messages': guestbook_data[-20:]
-        })
+        # Return only the latest messages to prevent overwhelming the frontend
+        return cached_response(*guestbook_snapshot(g.tenant).get())
     except Exception as e:
         print(f"Error retrieving guest book data: {e}")
         return jsonify({'error': 'Failed to retrieve guest book data'}), 500
@@ -246,22 +482,24 @@ def update_guestbook(message_id):
     """Update an existing guestbook message"""
     try:
         data = request.get_json()
-        guestbook_data = load_data(GUESTBOOK_FILE)
-        
-        # Find and update the guestbook message
-        for message in guestbook_data:
-            if message['id'] == message_id:
-                message.update({
-                    'name': data.get('name', message['name']),
-                    'relationship': data.get('relationship', message['relationship']),
-                    'message': data.get('message', message['message']),
-                    'timestamp': datetime.now().isoformat()
-                })
-                save_data(GUESTBOOK_FILE, guestbook_data)
-                return jsonify({
-                    'success': True,
-                    'message': 'Guestbook message updated successfully'
-                })
+        with storage.file_lock(g.tenant.guestbook_file):
+            guestbook_data = load_data(g.tenant.guestbook_file)
+            
+            # Find and update the guestbook message
+            for message in guestbook_data:
+                if message['id'] == message_id:
+                    message.update({
+                        'name': data.get('name', message['name']),
+                        'relationship': data.get('relationship', message['relationship']),
+                        'message': data.get('message', message['message']),
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    save_data(g.tenant.guestbook_file, guestbook_data)
+                    guestbook_snapshot(g.tenant).invalidate()
+                    return jsonify({
+                        'success': True,
+                        'message': 'Guestbook message updated successfully'
+                    })
         
         return jsonify({'error': 'Guestbook message not found'}), 404
     except Exception as e:
@@ -272,18 +510,20 @@ def update_guestbook(message_id):
 def delete_guestbook(message_id):
     """Delete a guestbook message"""
     try:
-        guestbook_data = load_data(GUESTBOOK_FILE)
-        
-        # Find and remove the guestbook message
-        for i, message in enumerate(guestbook_data):
-            if message['id'] == message_id:
-                deleted_name = message['name']
-                guestbook_data.pop(i)
-                save_data(GUESTBOOK_FILE, guestbook_data)
-                return jsonify({
-                    'success': True,
-                    'message': f'Guestbook message from {deleted_name} deleted successfully'
-                })
+        with storage.file_lock(g.tenant.guestbook_file):
+            guestbook_data = load_data(g.tenant.guestbook_file)
+            
+            # Find and remove the guestbook message
+            for i, message in enumerate(guestbook_data):
+                if message['id'] == message_id:
+                    deleted_name = message['name']
+                    guestbook_data.pop(i)
+                    save_data(g.tenant.guestbook_file, guestbook_data)
+                    guestbook_snapshot(g.tenant).invalidate()
+                    return jsonify({
+                        'success': True,
+                        'message': f'Guestbook message from {deleted_name} deleted successfully'
+                    })
         
         return jsonify({'error': 'Guestbook message not found'}), 404
     except Exception as e:
@@ -294,81 +534,14 @@ def delete_guestbook(message_id):
 def get_rsvp_stats():
     """Get RSVP statistics with enhanced metrics"""
     try:
-        rsvp_data = load_data(RSVP_FILE)
-        waitlist_data = load_data(WAITLIST_FILE)
-        guestbook_data = load_data(GUESTBOOK_FILE)
-        
-        # Basic RSVP stats
-        attending = len([r for r in rsvp_data if r.get('attendance') == 'attending'])
-        declining = len([r for r in rsvp_data if r.get('attendance') == 'declining'])
-        total = len(rsvp_data)
-        
-        # Calculate rates
-        attending_rate = f"{(attending / total * 100):.1f}%" if total > 0 else "0%"
-        declining_rate = f"{(declining / total * 100):.1f}%" if total > 0 else "0%"
-        
-        # Recent activity (last 24 hours)
-        now = datetime.now()
-        yesterday = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        last_24h_rsvps = len([r for r in rsvp_data 
-                             if datetime.fromisoformat(r['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > yesterday])
-        
-        # Waitlist stats
-        waitlist_today = len([w for w in waitlist_data 
-                             if datetime.fromisoformat(w['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > yesterday])
-        
-        # Guestbook stats
-        guestbook_today = len([g for g in guestbook_data 
-                              if datetime.fromisoformat(g['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > yesterday])
-        
-        # This week stats
-        week_ago = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=7)
-        guestbook_week = len([g for g in guestbook_data 
-                             if datetime.fromisoformat(g['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None) > week_ago])
-        
-        # Song requests
-        song_requests = len([r for r in rsvp_data if r.get('song', '').strip()])
-        
-        # Most active day
-        day_counts = {}
-        for r in rsvp_data:
-            date = datetime.fromisoformat(r['timestamp'].replace('Z', '+00:00')).strftime('%A')
-            day_counts[date] = day_counts.get(date, 0) + 1
-        
-        most_active_day = max(day_counts.items(), key=lambda x: x[1])[0] if day_counts else 'N/A'
-        
-        # Average response time (simplified - using submission time as proxy)
-        if rsvp_data:
-            # Calculate average time between submissions (as a proxy for response time)
-            timestamps = [datetime.fromisoformat(r['timestamp'].replace('Z', '+00:00')) for r in rsvp_data]
-            timestamps.sort()
-            if len(timestamps) > 1:
-                intervals = [(timestamps[i+1] - timestamps[i]).total_seconds() / 3600 for i in range(len(timestamps)-1)]
-                avg_interval = sum(intervals) / len(intervals)
-                avg_response_time = f"{avg_interval:.1f} hours"
-            else:
-                avg_response_time = "N/A"
-        else:
-            avg_response_time = "N/A"
+        # Archived RSVPs still count towards the headcount
+        rsvp_data = archived_entries(g.tenant, 'rsvp') + load_data(g.tenant.rsvp_file)
+        waitlist_data = load_data(g.tenant.waitlist_file)
+        guestbook_data = load_data(g.tenant.guestbook_file)
         
         return jsonify({
             'success': True,
-            'stats': {
-                'total': total,
-                'attending': attending,
-                'declining': declining,
-                'pending': total - attending - declining,
-                'attendingRate': attending_rate,
-                'decliningRate': declining_rate,
-                'last24h': last_24h_rsvps,
-                'waitlistToday': waitlist_today,
-                'guestbookToday': guestbook_today,
-                'guestbookWeek': guestbook_week,
-                'songRequests': song_requests,
-                'mostActiveDay': most_active_day,
-                'avgResponseTime': avg_response_time
-            }
+            'stats': admin_tasks.compute_rsvp_stats(rsvp_data, waitlist_data, guestbook_data)
         })
     except Exception as e:
         print(f"Error retrieving RSVP stats: {e}")
@@ -378,10 +551,14 @@ def get_rsvp_stats():
 def get_rsvp_data():
     """Retrieve all RSVP data"""
     try:
-        rsvp_data = load_data(RSVP_FILE)
+        rsvp_data = load_data(g.tenant.rsvp_file)
+        archived = archived_entries(g.tenant, 'rsvp')
+        if request.args.get('include_archived') == 'true':
+            rsvp_data = archived + rsvp_data
         return jsonify({
             'success': True,
-            'rsvps': rsvp_data
+            'rsvps': rsvp_data,
+            'archived': len(archived)
         })
     except Exception as e:
         print(f"Error retrieving RSVP data: {e}")
@@ -392,22 +569,23 @@ def update_rsvp(rsvp_id):
     """Update an existing RSVP"""
     try:
         data = request.get_json()
-        rsvp_data = load_data(RSVP_FILE)
-        
-        # Find and update the RSVP
-        for rsvp in rsvp_data:
-            if rsvp['id'] == rsvp_id:
-                rsvp.update({
-                    'name': data.get('name', rsvp['name']),
-                    'attendance': data.get('attendance', rsvp['attendance']),
-                    'song': data.get('song', rsvp.get('song', '')),
-                    'timestamp': datetime.now().isoformat()
-                })
-                save_data(RSVP_FILE, rsvp_data)
-                return jsonify({
-                    'success': True,
-                    'message': 'RSVP updated successfully'
-                })
+        with storage.file_lock(g.tenant.rsvp_file):
+            rsvp_data = load_data(g.tenant.rsvp_file)
+            
+            # Find and update the RSVP
+            for rsvp in rsvp_data:
+                if rsvp['id'] == rsvp_id:
+                    rsvp.update({
+                        'name': data.get('name', rsvp['name']),
+                        'attendance': data.get('attendance', rsvp['attendance']),
+                        'song': data.get('song', rsvp.get('song', '')),
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    save_data(g.tenant.rsvp_file, rsvp_data)
+                    return jsonify({
+                        'success': True,
+                        'message': 'RSVP updated successfully'
+                    })
         
         return jsonify({'error': 'RSVP not found'}), 404
     except Exception as e:
@@ -418,18 +596,19 @@ def update_rsvp(rsvp_id):
 def delete_rsvp(rsvp_id):
     """Delete an RSVP"""
     try:
-        rsvp_data = load_data(RSVP_FILE)
-        
-        # Find and remove the RSVP
-        for i, rsvp in enumerate(rsvp_data):
-            if rsvp['id'] == rsvp_id:
-                deleted_name = rsvp['name']
-                rsvp_data.pop(i)
-                save_data(RSVP_FILE, rsvp_data)
-                return jsonify({
-                    'success': True,
-                    'message': f'RSVP for {deleted_name} deleted successfully'
-                })
+        with storage.file_lock(g.tenant.rsvp_file):
+            rsvp_data = load_data(g.tenant.rsvp_file)
+            
+            # Find and remove the RSVP
+            for i, rsvp in enumerate(rsvp_data):
+                if rsvp['id'] == rsvp_id:
+                    deleted_name = rsvp['name']
+                    rsvp_data.pop(i)
+                    save_data(g.tenant.rsvp_file, rsvp_data)
+                    return jsonify({
+                        'success': True,
+                        'message': f'RSVP for {deleted_name} deleted successfully'
+                    })
         
         return jsonify({'error': 'RSVP not found'}), 404
     except Exception as e:
@@ -458,10 +637,8 @@ def submit_waitlist():
             'ip_address': request.remote_addr
         }
         
-        # Load existing data
-        waitlist_data = load_data(WAITLIST_FILE)
-        waitlist_data.append(waitlist_entry)
-        save_data(WAITLIST_FILE, waitlist_data)
+        # Append to the data file along with any concurrent submissions
+        collection_writer(g.tenant, 'waitlist').append(waitlist_entry)
         
         # Send email notification
         subject = "New Waitlist Submission"
@@ -488,7 +665,9 @@ def submit_waitlist():
 def get_waitlist_data():
     """Retrieve all waitlist data"""
     try:
-        waitlist_data = load_data(WAITLIST_FILE)
+        waitlist_data = load_data(g.tenant.waitlist_file)
+        if request.args.get('include_archived') == 'true':
+            waitlist_data = archived_entries(g.tenant, 'waitlist') + waitlist_data
         return jsonify({
             'success': True,
             'waitlist': waitlist_data
@@ -502,21 +681,22 @@ def update_waitlist(waitlist_id):
     """Update an existing waitlist entry"""
     try:
         data = request.get_json()
-        waitlist_data = load_data(WAITLIST_FILE)
-        
-        # Find and update the waitlist entry
-        for entry in waitlist_data:
-            if entry['id'] == waitlist_id:
-                entry.update({
-                    'name': data.get('name', entry['name']),
-                    'song': data.get('song', entry.get('song', '')),
-                    'timestamp': datetime.now().isoformat()
-                })
-                save_data(WAITLIST_FILE, waitlist_data)
-                return jsonify({
-                    'success': True,
-                    'message': 'Waitlist entry updated successfully'
-                })
+        with storage.file_lock(g.tenant.waitlist_file):
+            waitlist_data = load_data(g.tenant.waitlist_file)
+            
+            # Find and update the waitlist entry
+            for entry in waitlist_data:
+                if entry['id'] == waitlist_id:
+                    entry.update({
+                        'name': data.get('name', entry['name']),
+                        'song': data.get('song', entry.get('song', '')),
+                        'timestamp': datetime.now().isoformat()
+                    })
+                    save_data(g.tenant.waitlist_file, waitlist_data)
+                    return jsonify({
+                        'success': True,
+                        'message': 'Waitlist entry updated successfully'
+                    })
         
         return jsonify({'error': 'Waitlist entry not found'}), 404
     except Exception as e:
@@ -527,18 +707,19 @@ def update_waitlist(waitlist_id):
 def delete_waitlist(waitlist_id):
     """Delete a waitlist entry"""
     try:
-        waitlist_data = load_data(WAITLIST_FILE)
-        
-        # Find and remove the waitlist entry
-        for i, entry in enumerate(waitlist_data):
-            if entry['id'] == waitlist_id:
-                deleted_name = entry['name']
-                waitlist_data.pop(i)
-                save_data(WAITLIST_FILE, waitlist_data)
-                return jsonify({
-                    'success': True,
-                    'message': f'Waitlist entry for {deleted_name} deleted successfully'
-                })
+        with storage.file_lock(g.tenant.waitlist_file):
+            waitlist_data = load_data(g.tenant.waitlist_file)
+            
+            # Find and remove the waitlist entry
+            for i, entry in enumerate(waitlist_data):
+                if entry['id'] == waitlist_id:
+                    deleted_name = entry['name']
+                    waitlist_data.pop(i)
+                    save_data(g.tenant.waitlist_file, waitlist_data)
+                    return jsonify({
+                        'success': True,
+                        'message': f'Waitlist entry for {deleted_name} deleted successfully'
+                    })
         
         return jsonify({'error': 'Waitlist entry not found'}), 404
     except Exception as e:
@@ -549,11 +730,7 @@ def delete_waitlist(waitlist_id):
 def get_site_config():
     """Retrieve site configuration"""
     try:
-        config = load_data(SITE_CONFIG_FILE)
-        return jsonify({
-            'success': True,
-            'config': config
-        })
+        return cached_response(*site_config_snapshot(g.tenant).get())
     except Exception as e:
         print(f"Error retrieving site config: {e}")
         return jsonify({'error': 'Failed to retrieve site configuration'}), 500
@@ -563,19 +740,21 @@ def update_site_config():
     """Update site configuration"""
     try:
         data = request.get_json()
-        config = load_data(SITE_CONFIG_FILE)
-        
-        # Update specific fields if provided, otherwise keep existing
-        if 'showHotelInfo' in data:
-            config['showHotelInfo'] = data['showHotelInfo']
-        if 'hotelName' in data:
-            config['hotelName'] = data['hotelName']
-        if 'hotelAddress' in data:
-            config['hotelAddress'] = data['hotelAddress']
-        if 'bookingLink' in data:
-            config['bookingLink'] = data['bookingLink']
-        
-        save_data(SITE_CONFIG_FILE, config)
+        with storage.file_lock(g.tenant.site_config_file):
+            config = load_data(g.tenant.site_config_file)
+            
+            # Update specific fields if provided, otherwise keep existing
+            if 'showHotelInfo' in data:
+                config['showHotelInfo'] = data['showHotelInfo']
+            if 'hotelName' in data:
+                config['hotelName'] = data['hotelName']
+            if 'hotelAddress' in data:
+                config['hotelAddress'] = data['hotelAddress']
+            if 'bookingLink' in data:
+                config['bookingLink'] = data['bookingLink']
+            
+            save_data(g.tenant.site_config_file, config)
+        site_config_snapshot(g.tenant).invalidate()
         
         return jsonify({
             'success': True,
@@ -594,35 +773,11 @@ def import_rsvp_data():
         if not data or 'data' not in data:
             return jsonify({'error': 'No data provided'}), 400
         
-        imported_count = 0
-        existing_rsvps = load_data(RSVP_FILE)
-        existing_names = {rsvp['name'].lower() for rsvp in existing_rsvps}
-        
-        for row in data['data']:
-            # Validate required fields
-            if not row.get('name'):
-                continue
-                
-            # Skip if name already exists
-            if row['name'].lower() in existing_names:
-                continue
-            
-            # Create RSVP entry
-            rsvp_entry = {
-                'id': datetime.now().strftime('%Y%m%d_%H%M%S_%f'),
-                'name': row['name'],
-                'attendance': row.get('attendance', 'not_specified'),
-                'song': row.get('song', ''),
-                'timestamp': datetime.now().isoformat(),
-                'ip_address': 'imported',
-                'imported': True
-            }
-            
-            existing_rsvps.append(rsvp_entry)
-            existing_names.add(row['name'].lower())
-            imported_count += 1
-        
-        save_data(RSVP_FILE, existing_rsvps)
+        with storage.file_lock(g.tenant.rsvp_file):
+            existing_rsvps = load_data(g.tenant.rsvp_file)
+            imported_count = admin_tasks.merge_rsvp_rows(existing_rsvps, data['data'],
+                                                         archived_entries(g.tenant, 'rsvp'))
+            save_data(g.tenant.rsvp_file, existing_rsvps)
         
         return jsonify({
             'success': True,
@@ -642,37 +797,12 @@ def import_guest_data():
         if not data or 'data' not in data:
             return jsonify({'error': 'No data provided'}), 400
         
-        imported_count = 0
-        existing_guests = load_data(GUESTBOOK_FILE)
-        existing_names = {guest['name'].lower() for guest in existing_guests}
-        
-        for row in data['data']:
-            # Validate required fields
-            if not row.get('name'):
-                continue
-                
-            # Skip if name already exists
-            if row['name'].lower() in existing_names:
-                continue
-            
-            # Create guest entry (as a guestbook message)
-            guest_entry = {
-                'id': datetime.now().strftime('%Y%m%d_%H%M%S_%f'),
-                'name': row['name'],
-                'relationship': row.get('category', 'Other'),
-                'message': f"Imported guest: {row.get('email', 'No email')} | {row.get('phone', 'No phone')}",
-                'timestamp': datetime.now().isoformat(),
-                'ip_address': 'imported',
-                'imported': True,
-                'email': row.get('email', ''),
-                'phone': row.get('phone', '')
-            }
-            
-            existing_guests.append(guest_entry)
-            existing_names.add(row['name'].lower())
-            imported_count += 1
-        
-        save_data(GUESTBOOK_FILE, existing_guests)
+        with storage.file_lock(g.tenant.guestbook_file):
+            existing_guests = load_data(g.tenant.guestbook_file)
+            imported_count = admin_tasks.merge_guest_rows(existing_guests, data['data'],
+                                                          archived_entries(g.tenant, 'guestbook'))
+            save_data(g.tenant.guestbook_file, existing_guests)
+        guestbook_snapshot(g.tenant).invalidate()
         
         return jsonify({
             'success': True,
@@ -684,6 +814,280 @@ def import_guest_data():
         print(f"Error importing guest data: {e}")
         return jsonify({'error': 'Failed to import guest data'}), 500
 
+@app.route('/api/admin/archive', methods=['POST'])
+def run_archive():
+    """Move old entries into compressed archive segments"""
+    try:
+        data = request.get_json(silent=True) or {}
+        collections = data.get('collections', list(g.tenant.collection_files))
+        unknown = [name for name in collections if name not in g.tenant.collection_files]
+        if unknown:
+            return jsonify({'error': f"Unknown collection: {', '.join(unknown)}"}), 400
+        
+        max_age_days = data.get('maxAgeDays', ARCHIVE_POLICY['maxAgeDays'])
+        max_count = data.get('maxCount', ARCHIVE_POLICY['maxCount'])
+        if max_age_days is None and max_count is None:
+            return jsonify({'error': 'No retention policy: provide maxAgeDays or maxCount'}), 400
+        if max_age_days is not None and not is_non_negative(max_age_days, (int, float)):
+            return jsonify({'error': 'maxAgeDays must be a non-negative number'}), 400
+        if max_count is not None and not is_non_negative(max_count, int):
+            return jsonify({'error': 'maxCount must be a non-negative integer'}), 400
+        
+        tenant = g.tenant
+        results = {}
+        for name in collections:
+            results[name] = archive.archive_collection(
+                tenant.collection_files[name], tenant.archive_dir, name, load_data, save_data_durable,
+                max_age_days=max_age_days, max_count=max_count
+            )
+        guestbook_snapshot(g.tenant).invalidate()
+        
+        archived = sum(result['archived'] for result in results.values())
+        return jsonify({
+            'success': True,
+            'message': f'Archived {archived} entries',
+            'results': results
+        })
+    except Exception as e:
+        print(f"Error archiving data: {e}")
+        return jsonify({'error': 'Failed to archive data'}), 500
+
+@app.route('/api/admin/archive', methods=['GET'])
+def get_archive_report():
+    """Report active and archived entry counts per collection"""
+    try:
+        report = {}
+        for name, filename in g.tenant.collection_files.items():
+            report[name] = archive.archive_report(g.tenant.archive_dir, name)
+            report[name]['active'] = len(load_data(filename))
+        return jsonify({
+            'success': True,
+            'policy': ARCHIVE_POLICY,
+            'collections': report
+        })
+    except Exception as e:
+        print(f"Error retrieving archive report: {e}")
+        return jsonify({'error': 'Failed to retrieve archive report'}), 500
+
+@app.route('/api/admin/archive/<collection>', methods=['GET'])
+def get_archived_entries(collection):
+    """Retrieve archived entries for one collection"""
+    try:
+        if collection not in g.tenant.collection_files:
+            return jsonify({'error': 'Unknown collection'}), 404
+        return jsonify({
+            'success': True,
+            'entries': archive.load_archived(g.tenant.archive_dir, collection)
+        })
+    except Exception as e:
+        print(f"Error retrieving archived entries: {e}")
+        return jsonify({'error': 'Failed to retrieve archived entries'}), 500
+
+@app.route('/api/admin/backups', methods=['POST'])
+def create_backup():
+    """Take a snapshot of the data directory"""
+    try:
+        tenant = g.tenant
+        result = backup.create_snapshot(tenant.data_dir, tenant.backup_dir,
+                                        backup.data_lock_files(tenant.data_dir),
+                                        keep=BACKUP_POLICY['keep'])
+        return jsonify({
+            'success': True,
+            'message': f"Created backup {result['id']}",
+            'backup': result
+        })
+    except Exception as e:
+        print(f"Error creating backup: {e}")
+        return jsonify({'error': 'Failed to create backup'}), 500
+
+@app.route('/api/admin/backups', methods=['GET'])
+def get_backups():
+    """List available backup snapshots"""
+    try:
+        snapshots = [{
+            'id': manifest['id'],
+            'created': manifest['created'],
+            'files': len(manifest['files']),
+            'bytes': sum(info['size'] for info in manifest['files'].values())
+        } for manifest in backup.list_snapshots(g.tenant.backup_dir)]
+        return jsonify({
+            'success': True,
+            'backups': snapshots
+        })
+    except Exception as e:
+        print(f"Error listing backups: {e}")
+        return jsonify({'error': 'Failed to list backups'}), 500
+
+@app.route('/api/admin/backups/restore', methods=['POST'])
+def restore_backup():
+    """Restore the data directory to a snapshot id or point in time"""
+    try:
+        data = request.get_json(silent=True) or {}
+        target = data.get('backup') or data.get('at')
+        if not target:
+            return jsonify({'error': 'Provide a backup id or an "at" timestamp'}), 400
+        
+        tenant = g.tenant
+        manifest = backup.find_snapshot(tenant.backup_dir, target)
+        if manifest is None:
+            return jsonify({'error': 'Backup not found'}), 404
+        
+        safety, result = backup.restore_with_safety_snapshot(
+            tenant.data_dir, tenant.backup_dir, manifest, backup.data_lock_files(tenant.data_dir))
+        site_config_snapshot(tenant).invalidate()
+        guestbook_snapshot(tenant).invalidate()
+        
+        return jsonify({
+            'success': True,
+            'message': f"Restored backup {result['id']}",
+            'restore': result,
+            'preRestoreBackup': safety['id']
+        })
+    except Exception as e:
+        print(f"Error restoring backup: {e}")
+        return jsonify({'error': 'Failed to restore backup'}), 500
+
+@app.route('/api/admin/duplicates', methods=['GET'])
+def get_duplicates():
+    """Find likely duplicate names across RSVPs, the waitlist and imported guests"""
+    try:
+        try:
+            threshold = float(request.args.get('threshold', DUPLICATE_POLICY['threshold']))
+        except ValueError:
+            return jsonify({'error': 'Invalid threshold'}), 400
+        
+        # Archived entries are included so old records still match new ones
+        tenant = g.tenant
+        index = dedupe.NameIndex()
+        for rsvp in archived_entries(tenant, 'rsvp') + load_data(tenant.rsvp_file):
+            index.add(rsvp, 'rsvp')
+        for entry in archived_entries(tenant, 'waitlist') + load_data(tenant.waitlist_file):
+            index.add(entry, 'waitlist')
+        for guest in archived_entries(tenant, 'guestbook') + load_data(tenant.guestbook_file):
+            if guest.get('imported'):
+                index.add(guest, 'guests')
+        
+        groups = index.duplicate_groups(threshold)
+        groups.sort(key=lambda group: group['score'], reverse=True)
+        return jsonify({
+            'success': True,
+            'threshold': threshold,
+            'duplicates': groups
+        })
+    except Exception as e:
+        print(f"Error finding duplicates: {e}")
+        return jsonify({'error': 'Failed to find duplicates'}), 500
+
+@app.route('/api/admin/jobs', methods=['POST'])
+def submit_admin_job():
+    """Start a stats, import or export job in the background"""
+    try:
+        data = request.get_json(silent=True) or {}
+        job_type = data.get('type')
+        tenant = g.tenant
+        job_id = jobs.new_job_id()
+        params = {}
+        
+        if job_type == 'rsvp_stats':
+            func = admin_tasks.run_rsvp_stats
+            args = (tenant.rsvp_file, tenant.waitlist_file, tenant.guestbook_file, tenant.archive_dir)
+        elif job_type in ('import_rsvp', 'import_guests'):
+            if not isinstance(data.get('data'), list):
+                return jsonify({'error': 'No data provided'}), 400
+            kind = 'rsvp' if job_type == 'import_rsvp' else 'guests'
+            filename = tenant.rsvp_file if kind == 'rsvp' else tenant.guestbook_file
+            fmt = DATA_FORMATS.get(os.path.basename(filename), 'json')
+            func = admin_tasks.run_import
+            args = (kind, filename, data['data'], tenant.archive_dir, fmt)
+            params = {'rows': len(data['data'])}
+        elif job_type == 'export':
+            collection = data.get('collection')
+            if collection not in EXPORT_FIELDS:
+                return jsonify({'error': 'Unknown collection'}), 400
+            func = admin_tasks.run_export
+            args = (tenant.collection_files[collection], EXPORT_FIELDS[collection],
+                    jobs.result_path(tenant.jobs_dir, job_id, 'csv'))
+            params = {'collection': collection}
+        else:
+            return jsonify({'error': 'Unknown job type'}), 400
+        
+        job = jobs.submit_job(tenant.jobs_dir, job_id, job_type, func, args, params)
+        return jsonify({
+            'success': True,
+            'message': f'Job {job_id} queued',
+            'job': job
+        }), 202
+    except jobs.JobQueueFull as e:
+        return jsonify({'error': str(e)}), 429
+    except Exception as e:
+        print(f"Error submitting job: {e}")
+        return jsonify({'error': 'Failed to submit job'}), 500
+
+@app.route('/api/admin/jobs', methods=['GET'])
+def get_admin_jobs():
+    """List background jobs, newest first"""
+    try:
+        return jsonify({
+            'success': True,
+            'jobs': jobs.list_jobs(g.tenant.jobs_dir)
+        })
+    except Exception as e:
+        print(f"Error listing jobs: {e}")
+        return jsonify({'error': 'Failed to list jobs'}), 500
+
+@app.route('/api/admin/jobs/<job_id>', methods=['GET'])
+def get_admin_job(job_id):
+    """Poll the status and result of a background job"""
+    try:
+        job = jobs.get_job(g.tenant.jobs_dir, job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job
+        })
+    except Exception as e:
+        print(f"Error retrieving job: {e}")
+        return jsonify({'error': 'Failed to retrieve job'}), 500
+
+@app.route('/api/admin/jobs/<job_id>/result', methods=['GET'])
+def get_admin_job_result(job_id):
+    """Download the CSV written by a finished export job"""
+    try:
+        job = jobs.get_job(g.tenant.jobs_dir, job_id)
+        if job is None or job['type'] != 'export':
+            return jsonify({'error': 'Export not found'}), 404
+        if job['status'] != 'succeeded':
+            return jsonify({'error': f"Export is {job['status']}"}), 409
+        
+        return send_from_directory(
+            os.path.abspath(g.tenant.jobs_dir), f'{job_id}.csv', mimetype='text/csv', as_attachment=True,
+            download_name=f"{job['params']['collection']}_data.csv"
+        )
+    except Exception as e:
+        print(f"Error retrieving job result: {e}")
+        return jsonify({'error': 'Failed to retrieve job result'}), 500
+
+@app.route('/api/admin/jobs/<job_id>', methods=['DELETE'])
+def cancel_admin_job(job_id):
+    """Cancel a job that has not started yet"""
+    try:
+        job = jobs.cancel_job(g.tenant.jobs_dir, job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        if job['status'] != 'cancelled':
+            return jsonify({'error': f"Job is already {job['status']}"}), 409
+        
+        return jsonify({
+            'success': True,
+            'message': f'Job {job_id} cancelled',
+            'job': job
+        })
+    except Exception as e:
+        print(f"Error cancelling job: {e}")
+        return jsonify({'error': 'Failed to cancel job'}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -691,15 +1095,15 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'data_files': {
-            'rsvp': os.path.exists(RSVP_FILE),
-            'waitlist': os.path.exists(WAITLIST_FILE),
-            'guestbook': os.path.exists(GUESTBOOK_FILE),
-            'site_config': os.path.exists(SITE_CONFIG_FILE)
+            'rsvp': os.path.exists(g.tenant.rsvp_file),
+            'waitlist': os.path.exists(g.tenant.waitlist_file),
+            'guestbook': os.path.exists(g.tenant.guestbook_file),
+            'site_config': os.path.exists(g.tenant.site_config_file)
         }
     })
 
 if __name__ == '__main__':
-    ensure_data_files()
+    create_app()
     print("Wedding website backend started!")
     print("Data files initialized:", RSVP_FILE, "and", GUESTBOOK_FILE)
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Retention and archival for the growing collections.
+
+Entries older than a given age, or beyond a maximum count, are moved out
+of the active data file into gzip-compressed archive segments under
+data/archive/<collection>/. Guest-facing handlers only load the active
+file. Archived entries are read back for admin views and for anything
+that must see every record, such as RSVP totals and duplicate checks.
+"""
+
+import gzip
+import os
+from datetime import datetime, timedelta
+
+import storage
+
+
+def entry_time(entry):
+    """Parse an entry's timestamp, or None if it has no usable timestamp"""
+    try:
+        return datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00')).replace(tzinfo=None)
+    except (KeyError, AttributeError, ValueError):
+        return None
+
+
+def split_for_archive(entries, max_age_days=None, max_count=None, now=None):
+    """Split entries into (to_archive, to_keep), preserving their order"""
+    archive_indexes = set()
+
+    if max_age_days is not None:
+        try:
+            cutoff = (now or datetime.now()) - timedelta(days=max_age_days)
+        except OverflowError:
+            cutoff = None  # Before the earliest representable date, so nothing is that old
+        for index, entry in enumerate(entries):
+            timestamp = entry_time(entry)
+            if cutoff is not None and timestamp is not None and timestamp < cutoff:
+                archive_indexes.add(index)
+
+    if max_count is not None:
+        # Keep only the newest max_count entries still in the active file
+        remaining = [index for index in range(len(entries)) if index not in archive_indexes]
+        excess = len(remaining) - max_count
+        if excess > 0:
+            archive_indexes.update(remaining[:excess])
+
+    to_archive = [entry for index, entry in enumerate(entries) if index in archive_indexes]
+    to_keep = [entry for index, entry in enumerate(entries) if index not in archive_indexes]
+    return to_archive, to_keep
+
+
+def segment_dir(archive_dir, collection):
+    """Return the directory holding a collection's segments"""
+    return os.path.join(archive_dir, collection)
+
+
+def write_segment(archive_dir, collection, entries):
+    """Write entries to a new compressed segment and return its path"""
+    directory = segment_dir(archive_dir, collection)
+    os.makedirs(directory, exist_ok=True)
+    name = f"{collection}-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json.gz"
+    path = os.path.join(directory, name)
+    with open(path, 'wb') as f:
+        with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+            gz.write(storage.encode(entries, 'json'))
+        f.flush()
+        os.fsync(f.fileno())
+    storage.sync_directory(directory)
+    return path
+
+
+def list_segments(archive_dir, collection):
+    """Return segment paths for a collection, oldest first"""
+    directory = segment_dir(archive_dir, collection)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith('.json.gz')
+    )
+
+
+def read_segment(path):
+    """Load the entries stored in one segment"""
+    with gzip.open(path, 'rb') as gz:
+        return storage.decode(gz.read())
+
+
+def load_archived(archive_dir, collection):
+    """Load every archived entry for a collection, oldest first"""
+    entries = []
+    for path in list_segments(archive_dir, collection):
+        entries.extend(read_segment(path))
+    return entries
+
+
+class ArchivedEntries:
+    """Archived entries of one collection, kept in memory between archive runs.
+
+    Segments are never modified once written, so the entries only need
+    reloading when the list of segments changes, and new segments can be
+    read on their own.
+    """
+
+    def __init__(self, archive_dir, collection):
+        self.archive_dir = archive_dir
+        self.collection = collection
+        self._state = ([], [])
+
+    def get(self):
+        """Return every archived entry, oldest first; callers must not modify it"""
+        segments = list_segments(self.archive_dir, self.collection)
+        cached_segments, entries = self._state
+        if segments != cached_segments:
+            if cached_segments and segments[:len(cached_segments)] == cached_segments:
+                new_segments = segments[len(cached_segments):]
+            else:
+                new_segments, entries = segments, []
+            entries = entries + [entry for path in new_segments for entry in read_segment(path)]
+            self._state = (segments, entries)
+        return entries
+
+
+def archive_collection(filename, archive_dir, collection, load, save,
+                       max_age_days=None, max_count=None):
+    """Move old entries of one collection into a new archive segment.
+
+    The segment is written and flushed before the active file is
+    rewritten, so a crash in between can only duplicate entries, never
+    lose them.
+    """
+    with storage.file_lock(filename):
+        entries = load(filename)
+        to_archive, to_keep = split_for_archive(entries, max_age_days, max_count)
+        segment = None
+        if to_archive:
+            segment = write_segment(archive_dir, collection, to_archive)
+            save(filename, to_keep)
+
+    return {
+        'archived': len(to_archive),
+        'active': len(to_keep),
+        'segment': os.path.basename(segment) if segment else None
+    }
+
+
+def archive_report(archive_dir, collection):
+    """Summarize the archive segments of a collection"""
+    segments = list_segments(archive_dir, collection)
+    return {
+        'segments': len(segments),
+        'bytes': sum(os.path.getsize(path) for path in segments)
+    }
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Snapshot backups and point-in-time restore of the data directory.
+
+Each snapshot is a small manifest mapping every file under data/ to the
+SHA-256 of its contents. File contents are stored once, gzip-compressed,
+in backups/objects/, so a snapshot only stores the files that changed
+since the previous one. Files whose inode, mtime and size are unchanged
+since the previous snapshot are not even read.
+
+Snapshots do not block writers. save_data() always replaces files rather
+than modifying them, so an open file handle keeps pointing at one
+complete version of a file. A snapshot holds the collection locks just
+long enough to open every file, then reads and compresses them after the
+locks are released. Writes to backups/ itself (objects, manifests and
+rotation) are serialized by a lock on the backup directory, so a cron
+snapshot and an admin snapshot can run at the same time.
+
+Usage:
+    python3 backup.py create
+    python3 backup.py list
+    python3 backup.py restore <snapshot_id | ISO timestamp>
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+
+import storage
+
+# Snapshots kept by rotation when no other value is configured
+DEFAULT_KEEP = 14
+
+# Data files whose writers take a lock; all of them are held while the data
+# directory is snapshotted or restored
+LOCKED_DATA_FILES = ('rsvp_data.json', 'waitlist_data.json', 'guestbook_data.json', 'site_config.json')
+
+
+def data_lock_files(data_dir):
+    """Return the paths of the locked data files in data_dir"""
+    return [os.path.join(data_dir, name) for name in LOCKED_DATA_FILES]
+
+
+def iter_data_files(data_dir):
+    """Yield paths of data files relative to data_dir, skipping lock and temp files"""
+    for root, dirs, files in os.walk(data_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(('.lock', '.tmp')):
+                continue
+            yield os.path.relpath(os.path.join(root, name), data_dir)
+
+
+def object_path(backup_dir, digest):
+    """Return where the contents with the given digest are stored"""
+    return os.path.join(backup_dir, 'objects', f'{digest}.gz')
+
+
+def snapshot_path(backup_dir, snapshot_id):
+    """Return the manifest path of a snapshot"""
+    return os.path.join(backup_dir, 'snapshots', f'{snapshot_id}.json')
+
+
+def store_object(backup_dir, raw):
+    """Store file contents unless an identical copy exists; return (digest, stored_bytes)"""
+    digest = hashlib.sha256(raw).hexdigest()
+    path = object_path(backup_dir, digest)
+    if os.path.exists(path):
+        return digest, 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    compressed = gzip.compress(raw, compresslevel=6)
+    storage.write_bytes(path, compressed, fsync=True)
+    return digest, len(compressed)
+
+
+@contextmanager
+def store_lock(backup_dir):
+    """Serialize writes to the snapshot store across threads and processes.
+
+    Without it, a snapshot could reuse an object that a concurrent rotation
+    is deleting, leaving a manifest that points at a missing object.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    with storage.file_lock(os.path.join(backup_dir, 'store')):
+        yield
+
+
+@contextmanager
+def locked(lock_files):
+    """Hold the cross-process locks of several files, in a fixed order"""
+    with ExitStack() as stack:
+        for filename in sorted(lock_files):
+            stack.enter_context(storage.file_lock(filename))
+        yield
+
+
+def create_snapshot(data_dir, backup_dir, lock_files=(), keep=DEFAULT_KEEP):
+    """Take a consistent snapshot of data_dir and apply the rotation policy"""
+    start = time.perf_counter()
+    handles = []
+    with locked(lock_files):
+        for relpath in iter_data_files(data_dir):
+            try:
+                handles.append((relpath, open(os.path.join(data_dir, relpath), 'rb')))
+            except FileNotFoundError:
+                continue
+
+    # The data locks are released before the store lock is taken, so the
+    # two are always acquired in the same order
+    try:
+        with store_lock(backup_dir):
+            return _store_snapshot(backup_dir, handles, keep, start)
+    finally:
+        for relpath, f in handles:
+            f.close()
+
+
+def _store_snapshot(backup_dir, handles, keep, start):
+    """Store opened data files as a new snapshot; needs the store lock"""
+    # Files whose stat signature matches the previous snapshot are not re-read
+    previous = list_snapshots(backup_dir)
+    previous_files = previous[-1]['files'] if previous else {}
+
+    files = {}
+    stored_bytes = 0
+    read_bytes = 0
+    for relpath, f in handles:
+        st = os.fstat(f.fileno())
+        signature = [st.st_ino, st.st_mtime_ns, st.st_size]
+        known = previous_files.get(relpath)
+        if known and known.get('signature') == signature and \
+                os.path.exists(object_path(backup_dir, known['hash'])):
+            files[relpath] = known
+            continue
+        raw = f.read()
+        digest, stored = store_object(backup_dir, raw)
+        files[relpath] = {'hash': digest, 'size': len(raw), 'signature': signature}
+        stored_bytes += stored
+        read_bytes += len(raw)
+
+    snapshot_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    manifest = {
+        'id': snapshot_id,
+        'created': datetime.now().isoformat(),
+        'files': files
+    }
+    path = snapshot_path(backup_dir, snapshot_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    storage.write_bytes(path, json.dumps(manifest, indent=2).encode('utf-8'), fsync=True)
+
+    pruned = rotate_snapshots(backup_dir, keep) if keep else []
+    return {
+        'id': snapshot_id,
+        'files': len(files),
+        'bytes': read_bytes,
+        'storedBytes': stored_bytes,
+        'pruned': pruned,
+        'seconds': round(time.perf_counter() - start, 4)
+    }
+
+
+def list_snapshots(backup_dir):
+    """Return snapshot manifests, oldest first"""
+    directory = os.path.join(backup_dir, 'snapshots')
+    if not os.path.isdir(directory):
+        return []
+    manifests = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json'):
+            with open(os.path.join(directory, name)) as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+def rotate_snapshots(backup_dir, keep):
+    """Delete all but the newest `keep` snapshots and their unused objects.
+
+    Called by create_snapshot with the store lock held.
+    """
+    manifests = list_snapshots(backup_dir)
+    expired = manifests[:-keep] if len(manifests) > keep else []
+    for manifest in expired:
+        os.remove(snapshot_path(backup_dir, manifest['id']))
+
+    if expired:
+        referenced = {info['hash'] for manifest in manifests[-keep:]
+                      for info in manifest['files'].values()}
+        objects_dir = os.path.join(backup_dir, 'objects')
+        for name in os.listdir(objects_dir):
+            if name.endswith('.gz') and name[:-3] not in referenced:
+                os.remove(os.path.join(objects_dir, name))
+    return [manifest['id'] for manifest in expired]
+
+
+def find_snapshot(backup_dir, target):
+    """Find a snapshot by id, or the latest one taken at or before an ISO timestamp"""
+    manifests = list_snapshots(backup_dir)
+    for manifest in manifests:
+        if manifest['id'] == target:
+            return manifest
+
+    try:
+        point_in_time = datetime.fromisoformat(target.replace('Z', '+00:00'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if point_in_time.tzinfo is not None:
+        # Snapshot times are naive local time, e.g. from JS toISOString()
+        point_in_time = point_in_time.astimezone().replace(tzinfo=None)
+    candidates = [manifest for manifest in manifests
+                  if datetime.fromisoformat(manifest['created']) <= point_in_time]
+    return candidates[-1] if candidates else None
+
+
+def restore_snapshot(data_dir, backup_dir, manifest, lock_files=()):
+    """Replace the contents of data_dir with a snapshot.
+
+    Files that did not exist when the snapshot was taken (for example
+    newer archive segments) are removed so the directory matches the
+    snapshot exactly.
+    """
+    start = time.perf_counter()
+    restored_bytes = 0
+    with locked(lock_files), store_lock(backup_dir):
+        for relpath, info in manifest['files'].items():
+            with open(object_path(backup_dir, info['hash']), 'rb') as f:
+                raw = gzip.decompress(f.read())
+            destination = os.path.join(data_dir, relpath)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            storage.write_bytes(destination, raw, fsync=True)
+            restored_bytes += len(raw)
+
+        for relpath in list(iter_data_files(data_dir)):
+            if relpath not in manifest['files']:
+                os.remove(os.path.join(data_dir, relpath))
+
+    return {
+        'id': manifest['id'],
+        'files': len(manifest['files']),
+        'bytes': restored_bytes,
+        'seconds': round(time.perf_counter() - start, 4)
+    }
+
+
+def restore_with_safety_snapshot(data_dir, backup_dir, manifest, lock_files=()):
+    """Snapshot the current state, then restore a snapshot over it.
+
+    The current state is kept so an accidental restore can be undone. Both
+    steps share one lock scope so no write lands between them. Returns the
+    safety snapshot and restore results.
+    """
+    with locked(lock_files):
+        safety = create_snapshot(data_dir, backup_dir, keep=None)
+        result = restore_snapshot(data_dir, backup_dir, manifest)
+    return safety, result
+
+
+def main(argv):
+    """Command line entry point for cron jobs and manual restores"""
+    data_dir = os.getenv('DATA_DIR', 'data')
+    backup_dir = os.getenv('BACKUP_DIR', 'backups')
+    keep = int(os.getenv('BACKUP_KEEP', DEFAULT_KEEP))
+    lock_files = data_lock_files(data_dir)
+
+    if len(argv) >= 2 and argv[1] == 'create':
+        result = create_snapshot(data_dir, backup_dir, lock_files, keep)
+        print(f"Created snapshot {result['id']}: {result['files']} files, "
+              f"{result['storedBytes']} new bytes stored")
+        return 0
+
+    if len(argv) >= 2 and argv[1] == 'list':
+        for manifest in list_snapshots(backup_dir):
+            print(f"{manifest['id']}  {manifest['created']}  {len(manifest['files'])} files")
+        return 0
+
+    if len(argv) >= 3 and argv[1] == 'restore':
+        manifest = find_snapshot(backup_dir, argv[2])
+        if manifest is None:
+            print(f"No snapshot found for {argv[2]}")
+            return 1
+        safety, result = restore_with_safety_snapshot(data_dir, backup_dir, manifest, lock_files)
+        print(f"Restored snapshot {result['id']}: {result['files']} files "
+              f"(previous state saved as {safety['id']})")
+        return 0
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark backup and restore throughput of the data directory.
+
+Builds a data directory with RSVP, waitlist and guest book files of the
+given size, then times a full snapshot, an incremental snapshot after
+one collection changes, and a restore.
+
+Usage:
+    python3 benchmark_backup.py [records_per_collection]
+"""
+
+import os
+import sys
+import tempfile
+
+import backup
+import storage
+from benchmark_storage import make_records
+
+
+def report(label, result):
+    """Print one result row with throughput in MB/s"""
+    seconds = result['seconds']
+    rate = result['bytes'] / seconds / 1e6 if seconds else float('inf')
+    print(f"{label:<14}{result['bytes'] / 1e6:>10.1f}{seconds * 1000:>12.1f}{rate:>12.1f}")
+
+
+def main(argv):
+    """Run the backup benchmark"""
+    count = int(argv[1]) if len(argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, 'data')
+        backup_dir = os.path.join(tmp_dir, 'backups')
+        os.makedirs(data_dir)
+        lock_files = []
+        for name in ('rsvp_data.json', 'waitlist_data.json', 'guestbook_data.json'):
+            path = os.path.join(data_dir, name)
+            storage.save_file(path, make_records(count))
+            lock_files.append(path)
+        storage.save_file(os.path.join(data_dir, 'site_config.json'), {'showHotelInfo': True})
+
+        print(f"{count} records per collection")
+        print(f"{'step':<14}{'MB':>10}{'ms':>12}{'MB/s':>12}")
+        full = backup.create_snapshot(data_dir, backup_dir, lock_files)
+        report('full backup', full)
+
+        storage.save_file(lock_files[0], make_records(count + 1))
+        incremental = backup.create_snapshot(data_dir, backup_dir, lock_files)
+        report('incremental', incremental)
+        total = sum(info['size'] for info in backup.list_snapshots(backup_dir)[-1]['files'].values())
+        print(f"incremental read {incremental['bytes'] / 1e6:.1f} MB and stored "
+              f"{incremental['storedBytes'] / 1e6:.1f} MB of {total / 1e6:.1f} MB")
+
+        manifest = backup.find_snapshot(backup_dir, full['id'])
+        report('restore', backup.restore_snapshot(data_dir, backup_dir, manifest, lock_files))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark sustained submission throughput with and without group commit.
+
+Simulates a burst of RSVP submissions from many request threads against a
+collection that already holds some records. Both modes fsync every write,
+so the comparison is between one durable rewrite per submission and one
+durable rewrite per batch.
+
+Usage:
+    python3 benchmark_group_commit.py [threads] [submissions_per_thread] [existing_records]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import storage
+from group_commit import GroupCommitWriter
+from benchmark_storage import make_records
+
+
+def save_durable(filename, data):
+    """Save and fsync, as the app does for submissions"""
+    storage.save_file(filename, data, fsync=True)
+
+
+def run_threads(threads, per_thread, submit):
+    """Run submit(entry) from many threads and return submissions/sec"""
+    def worker(worker_id):
+        for i in range(per_thread):
+            submit({'id': f'{worker_id}_{i}', 'name': f'Burst Guest {worker_id} {i}',
+                    'attendance': 'attending', 'song': '', 'ip_address': '127.0.0.1'})
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return threads * per_thread / (time.perf_counter() - start)
+
+
+def main(argv):
+    """Compare per-request rewrites with group commit"""
+    threads = int(argv[1]) if len(argv) > 1 else 32
+    per_thread = int(argv[2]) if len(argv) > 2 else 10
+    existing = int(argv[3]) if len(argv) > 3 else 1000
+    total = threads * per_thread
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'rsvp_data.json')
+
+        # Per-request rewrite, serialized so no submissions are lost
+        storage.save_file(path, make_records(existing))
+        lock = threading.Lock()
+
+        def submit_per_request(entry):
+            with lock:
+                data = storage.load_file(path)
+                data.append(entry)
+                save_durable(path, data)
+
+        per_request_rate = run_threads(threads, per_thread, submit_per_request)
+        assert len(storage.load_file(path)) == existing + total
+
+        # Group commit
+        storage.save_file(path, make_records(existing))
+        writer = GroupCommitWriter(path, storage.load_file, save_durable)
+        group_rate = run_threads(threads, per_thread, writer.append)
+        assert len(storage.load_file(path)) == existing + total
+
+    print(f"{total} submissions from {threads} threads, {existing} existing records")
+    print(f"{'mode':<20}{'submissions/sec':>18}{'writes':>10}")
+    print(f"{'per-request':<20}{per_request_rate:>18.1f}{total:>10}")
+    print(f"{'group commit':<20}{group_rate:>18.1f}{writer.commits:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
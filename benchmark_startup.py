@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start time of the wedding website backend.
+
+Each measurement runs in a fresh interpreter so module caches do not
+hide regressions. Reports the median of several runs for:
+  - importing app (what test scripts and workers pay)
+  - importing app and calling create_app() (what the gunicorn master pays)
+  - importing wsgi (the full production entry point)
+
+Usage:
+    python3 benchmark_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+SNIPPETS = [
+    ('import app', 'import app'),
+    ('create_app()', 'import app; app.create_app()'),
+    ('import wsgi', 'import wsgi')
+]
+
+TIMER = """
+import time
+start = time.perf_counter()
+{code}
+print(time.perf_counter() - start)
+"""
+
+
+def time_snippet(code, runs):
+    """Return the median time of code across fresh interpreters"""
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-c', TIMER.format(code=code)],
+            cwd=project_dir
+        )
+        samples.append(float(output.decode().strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main(argv):
+    """Run every startup measurement"""
+    runs = int(argv[1]) if len(argv) > 1 else 5
+    print(f"{'step':<16}{'median ms':>12}")
+    for label, code in SNIPPETS:
+        print(f"{label:<16}{time_snippet(code, runs) * 1000:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
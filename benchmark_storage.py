@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark the on-disk data formats for the wedding website.
+
+Measures serialize time, parse time and file size at 10k and 100k
+records for the legacy indented JSON and every available format.
+
+Usage:
+    python3 benchmark_storage.py [record_count ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import storage
+
+
+def make_records(count):
+    """Build RSVP-shaped records for benchmarking"""
+    start = datetime(2025, 1, 1)
+    return [{
+        'id': f'20250101_{i:06d}',
+        'name': f'Guest Number {i}',
+        'attendance': 'attending' if i % 3 else 'declining',
+        'song': f'Song Request {i % 250}' if i % 2 else '',
+        'timestamp': (start + timedelta(minutes=i)).isoformat(),
+        'ip_address': f'10.0.{i // 256 % 256}.{i % 256}'
+    } for i in range(count)]
+
+
+def time_call(func, repeat=3):
+    """Return the best wall-clock time of func() over a few runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_format(records, label, encode, path):
+    """Benchmark one format and print a result row"""
+    serialize_time = time_call(lambda: encode(records))
+    with open(path, 'wb') as f:
+        f.write(encode(records))
+    parse_time = time_call(lambda: storage.load_file(path))
+    size = os.path.getsize(path)
+    print(f"{label:<14}{serialize_time * 1000:>14.1f}{parse_time * 1000:>12.1f}{size / 1024:>14.1f}")
+
+
+def main(argv):
+    """Run the benchmark for each requested record count"""
+    counts = [int(arg) for arg in argv[1:]] or [10000, 100000]
+
+    encoders = [('json indent=2', lambda data: json.dumps(data, indent=2).encode('utf-8'))]
+    for fmt in storage.available_formats():
+        encoders.append((fmt, lambda data, fmt=fmt: storage.encode(data, fmt)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in counts:
+            records = make_records(count)
+            print(f"\n{count} records")
+            print(f"{'format':<14}{'serialize ms':>14}{'parse ms':>12}{'size KiB':>14}")
+            for label, encode in encoders:
+                bench_format(records, label, encode, os.path.join(tmp_dir, 'bench.dat'))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
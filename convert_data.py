@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Convert existing wedding website data files to another on-disk format.
+
+Usage:
+    python3 convert_data.py msgpack data/rsvp_data.json data/guestbook_data.json
+    python3 convert_data.py json data/*.json
+
+Files are read in whatever format they are currently stored in and
+rewritten in place in the requested format (json or msgpack).
+
+The server writes each file in the format set by DATA_FORMAT or the
+collection's *_DATA_FORMAT variable (e.g. RSVP_DATA_FORMAT), so a
+converted file goes back to that format on its next save. Set the
+variable to the same format to keep it.
+"""
+
+import os
+import sys
+
+import storage
+
+
+def convert_file(filename, fmt):
+    """Rewrite a single data file in the given format"""
+    data = storage.load_file(filename)
+    before = os.path.getsize(filename)
+    storage.save_file(filename, data, fmt)
+    after = os.path.getsize(filename)
+    print(f"Converted {filename} to {fmt}: {before} -> {after} bytes")
+
+
+def main(argv):
+    """Convert the files named on the command line"""
+    if len(argv) < 3 or argv[1] not in storage.FORMATS:
+        print(__doc__)
+        return 1
+
+    fmt = argv[1]
+    if fmt not in storage.available_formats():
+        print(f"Format {fmt} is not available (is msgpack installed?)")
+        return 1
+
+    for filename in argv[2:]:
+        try:
+            convert_file(filename, fmt)
+        except Exception as e:
+            print(f"Failed to convert {filename}: {e}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,180 @@
+"""
+Duplicate and fuzzy-name detection for RSVPs, the waitlist and imported guests.
+
+Names are normalized (case, accents, punctuation and spacing removed) and
+indexed under a few cheap blocking keys: a phonetic key of the whole name
+and character trigrams. Only names that sound alike or share most of
+their trigrams are compared, so
+finding duplicates is roughly linear in the number of records instead of
+comparing every pair. Blocks that grow too large to be useful (very
+common trigrams) are skipped when collecting candidates.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+# Names at least this similar are reported as likely duplicates
+DEFAULT_THRESHOLD = 0.85
+
+# Blocks with more records than this are too common to narrow the search
+MAX_BLOCK_SIZE = 100
+
+_SOUNDEX_CODES = {}
+for _letters, _code in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'),
+                        ('l', '4'), ('mn', '5'), ('r', '6')):
+    for _letter in _letters:
+        _SOUNDEX_CODES[_letter] = _code
+
+
+def normalize_name(name):
+    """Normalize a name for comparison: "  Zoë  O'Brien " -> "zoe obrien" """
+    if not isinstance(name, str):
+        return ''
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    name = re.sub(r"[^\w\s]", '', name.lower())
+    return ' '.join(name.split())
+
+
+def soundex(word):
+    """Return the Soundex code of a single word, e.g. "john" -> "J500" """
+    letters = [ch for ch in word if ch in _SOUNDEX_CODES or ch in 'aeiouyhw']
+    if not letters:
+        return ''
+    first = letters[0]
+    codes = []
+    previous = _SOUNDEX_CODES.get(first, '')
+    for ch in letters[1:]:
+        code = _SOUNDEX_CODES.get(ch, '')
+        if code and code != previous:
+            codes.append(code)
+        if ch not in 'hw':
+            previous = code
+    return (first.upper() + ''.join(codes) + '000')[:4]
+
+
+def phonetic_key(normalized):
+    """Phonetic key of a normalized name, independent of word order"""
+    return ' '.join(sorted(soundex(token) for token in normalized.split()))
+
+
+def trigrams(normalized):
+    """Character trigrams of a normalized name, ignoring spaces"""
+    compact = normalized.replace(' ', '')
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def blocking_keys(normalized):
+    """Return the blocks a normalized name is indexed under"""
+    keys = {'p:' + phonetic_key(normalized)}
+    keys.update('g:' + gram for gram in trigrams(normalized))
+    return keys
+
+
+def name_similarity(a, b, threshold=0.0):
+    """Similarity between two normalized names, from 0.0 to 1.0.
+
+    Returns 0.0 early when cheap upper bounds show the names cannot reach
+    threshold, which skips most of the full comparisons.
+    """
+    if a == b:
+        return 1.0
+    if sorted(a.split()) == sorted(b.split()):
+        return 1.0
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+
+class NameIndex:
+    """Blocking index over records with a 'name' field"""
+
+    def __init__(self, records=(), collection=None):
+        self.records = []
+        self.collections = []
+        self.keys = []
+        self.blocks = defaultdict(list)
+        for record in records:
+            self.add(record, collection)
+
+    def add(self, record, collection=None):
+        """Index one record; records without a usable name are ignored"""
+        key = normalize_name(record.get('name'))
+        if not key:
+            return
+        position = len(self.records)
+        self.records.append(record)
+        self.collections.append(collection)
+        self.keys.append(key)
+        for block in blocking_keys(key):
+            self.blocks[block].append(position)
+
+    def candidates(self, key):
+        """Positions of records worth comparing with key.
+
+        A record is a candidate if it sounds the same, or shares at least
+        half of key's trigrams; similar names always share most trigrams.
+        """
+        found = set(self.blocks.get('p:' + phonetic_key(key), ()))
+        grams = trigrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            members = self.blocks.get('g:' + gram, ())
+            if len(members) <= MAX_BLOCK_SIZE:
+                for position in members:
+                    shared[position] += 1
+        needed = max(1, len(grams) // 2)
+        found.update(position for position, count in shared.items() if count >= needed)
+        return found
+
+    def find_matches(self, name, threshold=DEFAULT_THRESHOLD):
+        """Return (record, score) pairs for likely duplicates of a name, best first"""
+        key = normalize_name(name)
+        if not key:
+            return []
+        matches = []
+        for position in self.candidates(key):
+            score = name_similarity(key, self.keys[position], threshold)
+            if score >= threshold:
+                matches.append((self.records[position], score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def duplicate_groups(self, threshold=DEFAULT_THRESHOLD):
+        """Group indexed records that are likely the same person"""
+        parent = list(range(len(self.records)))
+
+        def find(position):
+            while parent[position] != position:
+                parent[position] = parent[parent[position]]
+                position = parent[position]
+            return position
+
+        best_scores = {}
+        for position, key in enumerate(self.keys):
+            for other in self.candidates(key):
+                if other <= position:
+                    continue
+                score = name_similarity(key, self.keys[other], threshold)
+                if score >= threshold:
+                    root, other_root = find(position), find(other)
+                    if root != other_root:
+                        parent[other_root] = root
+                    best_scores[position] = max(best_scores.get(position, 0), score)
+                    best_scores[other] = max(best_scores.get(other, 0), score)
+
+        groups = defaultdict(list)
+        for position in best_scores:
+            groups[find(position)].append(position)
+
+        return [{
+            'score': round(max(best_scores[position] for position in members), 3),
+            'records': [{
+                'collection': self.collections[position],
+                'id': self.records[position].get('id'),
+                'name': self.records[position].get('name')
+            } for position in sorted(members)]
+        } for members in groups.values()]
@@ -39,7 +39,7 @@ chmod 644 data/*.json
 echo "✅ Production setup complete!"
 echo ""
 echo "🎯 To run in production mode:"
-echo "   gunicorn --bind 0.0.0.0:5000 wsgi:app"
+echo "   gunicorn --preload --bind 0.0.0.0:5000 wsgi:app"
 echo ""
 echo "🎯 To run in development mode:"
 echo "   python3 app.py"
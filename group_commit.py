@@ -0,0 +1,98 @@
+"""
+Group commit for bursts of submissions to the same data file.
+
+Without batching, every submission does its own load + append + save of
+the whole collection. GroupCommitWriter lets concurrent request threads
+share that work: a writer that finds no write in progress commits its
+entry straight away. Writers arriving during that write queue up, and the
+first of them waits a few milliseconds for more to join before appending
+the whole batch in a single durable write. Each caller returns as soon as the batch
+containing its entry has been fsynced to disk.
+"""
+
+import threading
+import time
+
+import storage
+
+# How long the leader of a queued batch waits for others to join it
+GROUP_COMMIT_WINDOW = 0.005
+
+
+class _PendingWrite:
+    """An entry waiting to be committed, and the result of committing it"""
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.wake = threading.Event()
+        self.committed = False
+        self.error = None
+
+
+class GroupCommitWriter:
+    """Appends entries to a data file, committing concurrent appends together"""
+
+    def __init__(self, filename, load, save, window=GROUP_COMMIT_WINDOW):
+        self.filename = filename
+        self.load = load
+        self.save = save
+        self.window = window
+        self.commits = 0
+        self._lock = threading.Lock()
+        self._pending = []
+        self._flushing = False
+
+    def append(self, entry):
+        """Append an entry and block until it is durable on disk"""
+        pending = _PendingWrite(entry)
+        with self._lock:
+            self._pending.append(pending)
+            lead = not self._flushing
+            self._flushing = True
+
+        if not lead:
+            # Woken either once our batch is committed or to lead the next one
+            pending.wake.wait()
+        if not pending.committed:
+            # Only wait for others to join when writers are already queuing;
+            # a lone writer (e.g. under gunicorn's sync worker) commits at once
+            self._flush(wait=not lead)
+
+        if pending.error is not None:
+            raise pending.error
+
+    def _flush(self, wait):
+        """Commit one batch, then hand leadership to the next waiting writer.
+
+        Each leader commits only the batch it leads, so no caller is held
+        past the commit of its own entry however long a burst lasts.
+        """
+        if wait:
+            time.sleep(self.window)
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+        self._commit(batch)
+        with self._lock:
+            if self._pending:
+                self._pending[0].wake.set()
+            else:
+                self._flushing = False
+
+    def _commit(self, batch):
+        """Write one batch and wake every thread waiting on it"""
+        error = None
+        try:
+            # The file lock keeps batches from other workers from interleaving
+            with storage.file_lock(self.filename):
+                data = self.load(self.filename)
+                data.extend(pending.entry for pending in batch)
+                self.save(self.filename, data)
+            self.commits += 1
+        except Exception as e:
+            error = e
+
+        for pending in batch:
+            pending.error = error
+            pending.committed = True
+            pending.wake.set()
@@ -0,0 +1,299 @@
+"""
+Background jobs for CPU-heavy admin operations.
+
+Jobs run in a small process pool so stats recomputation, large imports
+and exports don't hold up the gunicorn worker thread serving guests. Each
+site has a job table (jobs_data.json in its jobs directory) that records
+every job's status and result. The table is shared by all workers
+through the same file locking as the data files, so a job submitted to
+one worker can be polled or cancelled through any other.
+
+Job lifecycle: queued -> running -> succeeded | failed, or
+queued -> cancelled. Jobs that have started cannot be cancelled.
+"""
+
+import os
+import threading
+from concurrent.futures import BrokenExecutor
+from datetime import datetime
+from functools import partial
+
+import storage
+
+# Worker processes per gunicorn worker
+DEFAULT_MAX_WORKERS = 2
+
+# Jobs queued or running in one gunicorn worker before new ones are refused
+DEFAULT_MAX_PENDING = 20
+
+# Finished jobs kept in the job table
+JOB_HISTORY = 200
+
+JOB_TABLE = 'jobs_data.json'
+
+_settings = {'maxWorkers': DEFAULT_MAX_WORKERS, 'maxPending': DEFAULT_MAX_PENDING}
+_executor = None
+_pending = 0
+_futures = {}
+_lock = threading.Lock()
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already queued"""
+
+
+def configure(max_workers=DEFAULT_MAX_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+    """Set pool limits; takes effect when the pool is next created"""
+    _settings.update({'maxWorkers': max_workers, 'maxPending': max_pending})
+
+
+def get_executor():
+    """Create the process pool on first use.
+
+    The pool is created lazily so that it is never started in the
+    gunicorn master under --preload, and uses spawn so that worker
+    processes do not inherit a copy of a multi-threaded server.
+    multiprocessing is imported here to keep it off the app's import path.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            _executor = ProcessPoolExecutor(
+                max_workers=_settings['maxWorkers'],
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def _discard_executor(executor):
+    """Drop a broken pool so the next job starts a fresh one"""
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _submit_to_pool(*args):
+    """Submit to the pool, replacing it once if a worker process has died"""
+    executor = get_executor()
+    try:
+        return executor, executor.submit(*args)
+    except BrokenExecutor:
+        _discard_executor(executor)
+        executor = get_executor()
+        return executor, executor.submit(*args)
+
+
+def shutdown():
+    """Stop the process pool, waiting for running jobs"""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def new_job_id():
+    return datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+
+
+def job_table_path(jobs_dir):
+    return os.path.join(jobs_dir, JOB_TABLE)
+
+
+def result_path(jobs_dir, job_id, extension):
+    """Where a job writes a result file such as a CSV export"""
+    return os.path.join(jobs_dir, f'{job_id}.{extension}')
+
+
+def _load_jobs(jobs_dir):
+    try:
+        return storage.load_file(job_table_path(jobs_dir))
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def _update_job(jobs_dir, job_id, update):
+    """Apply update(job) to one job under the table lock; return the job"""
+    path = job_table_path(jobs_dir)
+    with storage.file_lock(path):
+        jobs = _load_jobs(jobs_dir)
+        for job in jobs:
+            if job['id'] == job_id:
+                if update(job) is False:
+                    return job
+                storage.save_file(path, jobs)
+                return job
+    return None
+
+
+def _add_job(jobs_dir, job):
+    """Add a job to the table, dropping the oldest finished jobs"""
+    os.makedirs(jobs_dir, exist_ok=True)
+    path = job_table_path(jobs_dir)
+    with storage.file_lock(path):
+        jobs = _load_jobs(jobs_dir)
+        jobs.append(job)
+        finished = [j for j in jobs if j['status'] in ('succeeded', 'failed', 'cancelled')]
+        for old in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            jobs.remove(old)
+            for name in os.listdir(jobs_dir):
+                if name.startswith(old['id'] + '.'):
+                    os.remove(os.path.join(jobs_dir, name))
+        storage.save_file(path, jobs)
+
+
+def _process_start_time(pid):
+    """Start time of a process in clock ticks since boot, or None if unknown"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces, so count fields after it;
+    # starttime is field 22 of the file and the 20th after the name
+    return int(stat.rsplit(')', 1)[1].split()[19])
+
+
+def _owner_alive(job):
+    """Check whether the server process that queued a job is still running.
+
+    PIDs are reused, e.g. after a container restart, so the owner's start
+    time is compared as well when it was recorded.
+    """
+    pid = job['owner']
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    started = job.get('ownerStarted')
+    return started is None or _process_start_time(pid) == started
+
+
+def _mark_if_orphaned(jobs_dir, job):
+    """Fail jobs whose owning server process has exited without finishing them"""
+    if job['status'] in ('queued', 'running') and not _owner_alive(job):
+        return _update_job(jobs_dir, job['id'], partial(_fail, error='Interrupted by server restart')) or job
+    return job
+
+
+def list_jobs(jobs_dir):
+    """Return every job in the table, newest first"""
+    return [_mark_if_orphaned(jobs_dir, job) for job in reversed(_load_jobs(jobs_dir))]
+
+
+def get_job(jobs_dir, job_id):
+    """Return one job, or None if it doesn't exist"""
+    for job in _load_jobs(jobs_dir):
+        if job['id'] == job_id:
+            return _mark_if_orphaned(jobs_dir, job)
+    return None
+
+
+def submit_job(jobs_dir, job_id, job_type, func, args, params=None):
+    """Queue func(*args) to run in the process pool and return the job record"""
+    global _pending
+    with _lock:
+        if _pending >= _settings['maxPending']:
+            raise JobQueueFull('Too many jobs are already queued')
+        _pending += 1
+
+    job = {
+        'id': job_id,
+        'type': job_type,
+        'params': params or {},
+        'status': 'queued',
+        'created': datetime.now().isoformat(),
+        'owner': os.getpid(),
+        'ownerStarted': _process_start_time(os.getpid())
+    }
+    try:
+        _add_job(jobs_dir, job)
+    except Exception:
+        with _lock:
+            _pending -= 1
+        raise
+
+    try:
+        executor, future = _submit_to_pool(_run_job, jobs_dir, job_id, func, args)
+    except Exception as e:
+        with _lock:
+            _pending -= 1
+        _update_job(jobs_dir, job_id, partial(_fail, error=f'Could not start job: {e}'))
+        raise
+
+    with _lock:
+        _futures[job_id] = future
+    future.add_done_callback(partial(_job_finished, jobs_dir, job_id, executor))
+    return job
+
+
+def cancel_job(jobs_dir, job_id):
+    """Cancel a queued job; returns the job, or None if it doesn't exist"""
+    def cancel(job):
+        if job['status'] != 'queued':
+            return False
+        job.update({'status': 'cancelled', 'finished': datetime.now().isoformat()})
+
+    job = _update_job(jobs_dir, job_id, cancel)
+    if job is not None and job['status'] == 'cancelled':
+        # Skip the pool slot too if this worker queued the job
+        with _lock:
+            future = _futures.get(job_id)
+        if future is not None:
+            future.cancel()
+    return job
+
+
+def _run_job(jobs_dir, job_id, func, args):
+    """Runs in a pool process: claim the job, then do the work"""
+    def start(job):
+        if job['status'] != 'queued':
+            return False
+        job.update({'status': 'running', 'started': datetime.now().isoformat(), 'worker': os.getpid()})
+
+    job = _update_job(jobs_dir, job_id, start)
+    if job is None or job['status'] != 'running':
+        return None  # Cancelled before it started
+    return func(*args)
+
+
+def _fail(job, error):
+    """Mark an unfinished job as failed"""
+    if job['status'] not in ('queued', 'running'):
+        return False
+    job.update({'status': 'failed', 'error': error, 'finished': datetime.now().isoformat()})
+
+
+def _job_finished(jobs_dir, job_id, executor, future):
+    """Runs in the server process when a job's future completes"""
+    global _pending
+    with _lock:
+        _pending -= 1
+        _futures.pop(job_id, None)
+
+    if future.cancelled():
+        return
+
+    error = future.exception()
+    if isinstance(error, BrokenExecutor):
+        # A pool process died (e.g. killed for running out of memory);
+        # every job still in this pool fails and the next one gets a new pool
+        _discard_executor(executor)
+
+    def finish(job):
+        if error is not None:
+            return _fail(job, str(error) or type(error).__name__)
+        if job['status'] != 'running':
+            return False
+        job.update({'status': 'succeeded', 'result': future.result(), 'finished': datetime.now().isoformat()})
+
+    try:
+        _update_job(jobs_dir, job_id, finish)
+    except Exception as e:
+        print(f"Error recording result of job {job_id}: {e}")
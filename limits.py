@@ -0,0 +1,79 @@
+"""
+Request size limits, checked before a JSON body is handed to a route.
+
+Bodies are rejected as early as possible: first by Content-Length, then
+while reading (for chunked bodies with no length), and finally while
+parsing. Parsing runs with an object hook that checks field lengths and
+counts objects as the decoder produces them, so an import with too many
+rows or a name that is far too long stops the parse at the first
+offending object instead of after the whole document has been built.
+"""
+
+import json
+
+# Default body cap for guest forms and admin edits
+DEFAULT_MAX_BODY = 64 * 1024
+
+# Body cap for CSV imports sent as JSON rows
+DEFAULT_MAX_IMPORT_BODY = 2 * 1024 * 1024
+
+# Rows accepted in one import
+DEFAULT_MAX_IMPORT_ROWS = 5000
+
+# Longest accepted value, in characters, of these fields in any object
+DEFAULT_FIELD_LIMITS = {'name': 200, 'song': 200, 'message': 5000}
+
+READ_CHUNK = 64 * 1024
+
+
+class PayloadRejected(Exception):
+    """Raised when a request body breaks a limit; status is the HTTP status to return"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def check_content_length(content_length, max_body):
+    """Reject a body from its Content-Length header alone"""
+    if content_length is not None and content_length > max_body:
+        raise PayloadRejected(f'Request body too large (max {max_body} bytes)', 413)
+
+
+def read_body(stream, max_body):
+    """Read a request body, stopping as soon as it grows past max_body"""
+    chunks = []
+    size = 0
+    while True:
+        chunk = stream.read(min(READ_CHUNK, max_body + 1 - size))
+        if not chunk:
+            return b''.join(chunks)
+        size += len(chunk)
+        if size > max_body:
+            raise PayloadRejected(f'Request body too large (max {max_body} bytes)', 413)
+        chunks.append(chunk)
+
+
+def parse_json(raw, field_limits=DEFAULT_FIELD_LIMITS, max_rows=None):
+    """Parse a JSON body, rejecting long fields and too many rows during the parse.
+
+    Rows are counted as JSON objects, allowing one more for the object
+    that wraps them.
+    """
+    count = 0
+
+    def check_object(obj):
+        nonlocal count
+        count += 1
+        if max_rows is not None and count > max_rows + 1:
+            raise PayloadRejected(f'Too many rows (max {max_rows})', 413)
+        for field, limit in field_limits.items():
+            value = obj.get(field)
+            if isinstance(value, str) and len(value) > limit:
+                raise PayloadRejected(f'{field} is too long (max {limit} characters)')
+        return obj
+
+    try:
+        return json.loads(raw, object_hook=check_object)
+    except (ValueError, RecursionError):
+        raise PayloadRejected('Invalid JSON body')
@@ -0,0 +1,66 @@
+"""
+Cached, pre-encoded views of data files shared consistently across workers.
+
+A FileSnapshot keeps the result of building a response body from a data
+file and only rebuilds it when the file changes on disk. Changes are
+detected by comparing the file's stat signature (inode, mtime, size) on
+each read. Because save_data() replaces files atomically, a write in any
+gunicorn worker changes the signature and every other worker picks up
+the new version on its next request, without re-reading the file in
+between.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+_compact_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def file_signature(filename):
+    """Return a value that changes whenever the file is replaced or rewritten"""
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def with_etag(body):
+    """Return (body, etag) for a pre-encoded response body"""
+    return body, hashlib.sha1(body).hexdigest()[:20]
+
+
+def encode_json_body(payload):
+    """Encode a response payload once, returning (body, etag)"""
+    return with_etag(_compact_encoder.encode(payload).encode('utf-8'))
+
+
+class FileSnapshot:
+    """Cached value built from a data file, rebuilt when the file changes"""
+
+    def __init__(self, filename, loader, builder):
+        self.filename = filename
+        self.loader = loader
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._signature = None
+        self._value = None
+
+    def get(self):
+        """Return the current value, rebuilding it if the file has changed"""
+        signature = file_signature(self.filename)
+        if self._value is None or signature != self._signature:
+            with self._lock:
+                if self._value is None or signature != self._signature:
+                    # A write racing this rebuild changes the signature again,
+                    # so the next call rebuilds rather than serving stale data
+                    self._value = self.builder(self.loader(self.filename))
+                    self._signature = signature
+        return self._value
+
+    def invalidate(self):
+        """Force a rebuild on the next get()"""
+        with self._lock:
+            self._value = None
@@ -0,0 +1,122 @@
+"""
+On-disk serialization for the wedding website data files.
+
+Collections can be stored as compact JSON (the default) or as MessagePack
+(when the msgpack package is installed). MessagePack files start with a
+short magic header so that load_file() can detect the format of any data
+file and read it transparently, whatever format it was written in.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import msgpack
+except ImportError:  # MessagePack support is optional
+    msgpack = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+MSGPACK_MAGIC = b'WMP1'
+
+_compact_encoder = json.JSONEncoder(separators=(',', ':'))
+
+FORMATS = ('json', 'msgpack')
+
+
+def available_formats():
+    """Return the formats that can be written in this environment"""
+    return [fmt for fmt in FORMATS if fmt != 'msgpack' or msgpack is not None]
+
+
+def detect_format(raw):
+    """Detect the format of raw file contents"""
+    if raw.startswith(MSGPACK_MAGIC):
+        return 'msgpack'
+    return 'json'
+
+
+def encode(data, fmt='json'):
+    """Serialize data to bytes in the given format"""
+    if fmt == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError('msgpack format requested but msgpack is not installed')
+        return MSGPACK_MAGIC + msgpack.packb(data, use_bin_type=True)
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown data format: {fmt}')
+    return _compact_encoder.encode(data).encode('utf-8')
+
+
+def decode(raw):
+    """Deserialize bytes written by encode(), detecting the format"""
+    fmt = detect_format(raw)
+    if fmt == 'msgpack':
+        if msgpack is None:
+            raise RuntimeError('File is in msgpack format but msgpack is not installed')
+        return msgpack.unpackb(raw[len(MSGPACK_MAGIC):], raw=False)
+    return json.loads(raw)
+
+
+def load_file(filename):
+    """Read a data file in any supported format"""
+    with open(filename, 'rb') as f:
+        return decode(f.read())
+
+
+def save_file(filename, data, fmt='json', fsync=False):
+    """Write a data file in the given format.
+
+    The data is written to a temporary file which then replaces the
+    original, so readers in other workers never see a partial file.
+    With fsync=True the file and its directory entry are flushed to disk
+    before returning.
+    """
+    write_bytes(filename, encode(data, fmt), fsync=fsync)
+
+
+def write_bytes(filename, raw, fsync=False):
+    """Atomically replace filename with raw bytes"""
+    tmp_filename = f'{filename}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(raw)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+    if fsync:
+        sync_directory(os.path.dirname(filename) or '.')
+
+
+def sync_directory(path):
+    """Flush a directory entry (e.g. after os.replace) to disk"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # Not supported on this platform
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(filename):
+    """Hold an exclusive lock for filename across processes.
+
+    Uses a sidecar .lock file so the data file itself can be replaced
+    while the lock is held. On platforms without fcntl this is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(filename + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,32 @@
+"""
+Throwaway wedding sites for tests that go through the Flask app.
+"""
+
+import tempfile
+from contextlib import contextmanager
+
+import app
+
+
+@contextmanager
+def temporary_sites(*tenant_ids, mode='path'):
+    """Serve sites from a temporary tenants directory.
+
+    Creates each named site with empty data files and yields a test client
+    and a dict of the created Tenant objects. The tenant policy and registry
+    settings are restored afterwards, including any changes made by the test.
+    """
+    app.create_app()
+    saved = (dict(app.TENANT_POLICY), app.tenant_registry.tenants_dir, app.tenant_registry.max_tenants)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app.TENANT_POLICY['mode'] = mode
+        app.tenant_registry.configure(tmp_dir, 10)
+        try:
+            sites = {}
+            for tenant_id in tenant_ids:
+                sites[tenant_id] = app.tenant_registry.create(tenant_id)
+                app.ensure_data_files(sites[tenant_id])
+            yield app.app.test_client(), sites
+        finally:
+            app.TENANT_POLICY.update(saved[0])
+            app.tenant_registry.configure(saved[1], saved[2])
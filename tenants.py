@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Multi-tenant support: many wedding sites served from one process.
+
+Each tenant has its own directory holding its data files, archive
+segments, backups and background job table, plus its own in-memory caches (site config and
+guestbook snapshots, group-commit writers, name index). Tenants are
+resolved per request from the Host header or from a /t/<tenant>/ path
+prefix.
+
+Only the most recently used tenants keep their caches in memory. When
+more than max_tenants are active, the least recently used tenant's
+Tenant object is dropped along with everything it cached; it is rebuilt
+from disk on that tenant's next request. The default tenant (the
+original single-site data/ directory) is never evicted.
+
+Usage:
+    python3 tenants.py create <tenant_id>
+    python3 tenants.py list
+"""
+
+import ipaddress
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+# Tenant ids become directory names, so only allow safe characters
+TENANT_ID_PATTERN = re.compile(r'^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$')
+
+DEFAULT_TENANT_ID = 'default'
+
+# Tenants whose caches are kept in memory at once
+DEFAULT_MAX_TENANTS = 256
+
+PATH_PREFIX = '/t/'
+
+
+def is_valid_tenant_id(tenant_id):
+    """Check that a tenant id is safe to use as a directory name"""
+    return bool(tenant_id) and TENANT_ID_PATTERN.match(tenant_id) is not None
+
+
+# Host names that reach the default site rather than naming a tenant
+DEFAULT_HOST_LABELS = ('www', 'localhost')
+
+
+def tenant_id_from_host(host, base_domain=None):
+    """Resolve a tenant id from a Host header.
+
+    With a base domain, "smith-jones.example.com" resolves to
+    "smith-jones". Without one, the first label of the host name is used.
+    Returns None (the default site) for hosts outside the base domain, the
+    base domain itself, www, localhost and IP addresses.
+    """
+    hostname = (host or '').lower()
+    if hostname.startswith('['):
+        return None  # IPv6 literal
+    hostname = hostname.split(':')[0].rstrip('.')
+    try:
+        ipaddress.ip_address(hostname)
+        return None
+    except ValueError:
+        pass
+    if base_domain:
+        suffix = '.' + base_domain.lower()
+        if not hostname.endswith(suffix):
+            return None
+        hostname = hostname[:-len(suffix)]
+    label = hostname.split('.')[0]
+    if not label or label in DEFAULT_HOST_LABELS:
+        return None
+    return label
+
+
+class Tenant:
+    """Storage paths and in-memory caches of one wedding site"""
+
+    def __init__(self, tenant_id, data_dir, backup_dir, jobs_dir):
+        self.id = tenant_id
+        self.data_dir = data_dir
+        self.backup_dir = backup_dir
+        self.jobs_dir = jobs_dir
+        self.archive_dir = os.path.join(data_dir, 'archive')
+        self.rsvp_file = os.path.join(data_dir, 'rsvp_data.json')
+        self.waitlist_file = os.path.join(data_dir, 'waitlist_data.json')
+        self.guestbook_file = os.path.join(data_dir, 'guestbook_data.json')
+        self.site_config_file = os.path.join(data_dir, 'site_config.json')
+        self.collection_files = {
+            'rsvp': self.rsvp_file,
+            'waitlist': self.waitlist_file,
+            'guestbook': self.guestbook_file
+        }
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def cached(self, name, factory):
+        """Return this tenant's cached object called name, creating it on first use"""
+        value = self._caches.get(name)
+        if value is None:
+            with self._lock:
+                value = self._caches.get(name)
+                if value is None:
+                    value = factory()
+                    self._caches[name] = value
+        return value
+
+
+class TenantRegistry:
+    """Resolves tenant ids to Tenant objects, keeping only recent ones in memory"""
+
+    def __init__(self, tenants_dir, default_data_dir, default_backup_dir,
+                 max_tenants=DEFAULT_MAX_TENANTS, default_jobs_dir='jobs'):
+        self.tenants_dir = tenants_dir
+        self.max_tenants = max_tenants
+        self.default = Tenant(DEFAULT_TENANT_ID, default_data_dir, default_backup_dir, default_jobs_dir)
+        self._tenants = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, tenants_dir, max_tenants):
+        """Apply settings loaded after import, dropping any cached tenants"""
+        with self._lock:
+            self.tenants_dir = tenants_dir
+            self.max_tenants = max_tenants
+            self._tenants.clear()
+
+    def tenant_dir(self, tenant_id):
+        """Return the directory holding a tenant's data and backups"""
+        return os.path.join(self.tenants_dir, tenant_id)
+
+    def exists(self, tenant_id):
+        """Check whether a tenant has been created on disk"""
+        return is_valid_tenant_id(tenant_id) and os.path.isdir(self.tenant_dir(tenant_id))
+
+    def get(self, tenant_id):
+        """Return the Tenant for an id, or None if there is no such tenant"""
+        if tenant_id is None or tenant_id == DEFAULT_TENANT_ID:
+            return self.default
+
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if tenant is not None:
+                self._tenants.move_to_end(tenant_id)
+                return tenant
+
+        if not self.exists(tenant_id):
+            return None
+
+        directory = self.tenant_dir(tenant_id)
+        tenant = Tenant(tenant_id, os.path.join(directory, 'data'), os.path.join(directory, 'backups'),
+                        os.path.join(directory, 'jobs'))
+        with self._lock:
+            # Another thread may have loaded the same tenant meanwhile
+            tenant = self._tenants.setdefault(tenant_id, tenant)
+            self._tenants.move_to_end(tenant_id)
+            while len(self._tenants) > self.max_tenants:
+                self._tenants.popitem(last=False)
+        return tenant
+
+    def cached_tenant_ids(self):
+        """Ids of tenants currently held in memory, least recently used first"""
+        with self._lock:
+            return list(self._tenants)
+
+    def create(self, tenant_id):
+        """Create a tenant's directories and return it"""
+        if not is_valid_tenant_id(tenant_id) or tenant_id == DEFAULT_TENANT_ID:
+            raise ValueError(f'Invalid tenant id: {tenant_id}')
+        os.makedirs(os.path.join(self.tenant_dir(tenant_id), 'data'), exist_ok=True)
+        return self.get(tenant_id)
+
+    def list_ids(self):
+        """Ids of every tenant on disk"""
+        if not os.path.isdir(self.tenants_dir):
+            return []
+        return sorted(name for name in os.listdir(self.tenants_dir) if self.exists(name))
+
+
+class TenantPathMiddleware:
+    """WSGI middleware that serves /t/<tenant>/... as that tenant's site.
+
+    The prefix is moved from PATH_INFO to SCRIPT_NAME so the app sees the
+    usual routes, and the tenant id is stored in the WSGI environ.
+    """
+
+    ENVIRON_KEY = 'wedding.tenant_id'
+
+    def __init__(self, wsgi_app, enabled=lambda: True):
+        self.wsgi_app = wsgi_app
+        self.enabled = enabled
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if self.enabled() and path.startswith(PATH_PREFIX):
+            tenant_id, slash, rest = path[len(PATH_PREFIX):].partition('/')
+            if not slash:
+                # Pages use relative API URLs, so they need the trailing slash
+                start_response('301 Moved Permanently', [('Location', environ.get('SCRIPT_NAME', '') + path + '/')])
+                return [b'']
+            environ[self.ENVIRON_KEY] = tenant_id
+            environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + PATH_PREFIX + tenant_id
+            environ['PATH_INFO'] = '/' + rest
+        return self.wsgi_app(environ, start_response)
+
+
+def main(argv):
+    """Command line entry point for provisioning tenants"""
+    import app
+
+    app.create_app()
+    registry = app.tenant_registry
+
+    if len(argv) >= 3 and argv[1] == 'create':
+        try:
+            tenant = registry.create(argv[2])
+        except ValueError as e:
+            print(e)
+            return 1
+        app.ensure_data_files(tenant)
+        print(f"Created tenant {tenant.id} in {registry.tenant_dir(tenant.id)}")
+        return 0
+
+    if len(argv) >= 2 and argv[1] == 'list':
+        for tenant_id in registry.list_ids():
+            print(tenant_id)
+        return 0
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for archiving old entries out of the active data files.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import archive
+import storage
+from tenant_fixtures import temporary_sites
+
+
+def make_entries():
+    """Build entries from 10 days ago up to today, oldest first"""
+    now = datetime.now()
+    return [{'id': str(day), 'name': f'Guest {day}',
+             'timestamp': (now - timedelta(days=10 - day)).isoformat()}
+            for day in range(10)]
+
+
+def test_split_by_age_and_count():
+    """Entries are archived by age, then by count, keeping the newest"""
+    entries = make_entries()
+
+    to_archive, to_keep = archive.split_for_archive(entries, max_age_days=5.5)
+    assert [e['id'] for e in to_keep] == ['5', '6', '7', '8', '9']
+    assert len(to_archive) == 5
+
+    to_archive, to_keep = archive.split_for_archive(entries, max_age_days=5.5, max_count=2)
+    assert [e['id'] for e in to_keep] == ['8', '9']
+    assert [e['id'] for e in to_archive] == [str(day) for day in range(8)]
+
+
+def test_archive_collection_round_trip():
+    """Archived entries leave the active file and can still be read back"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'rsvp_data.json')
+        archive_dir = os.path.join(tmp_dir, 'archive')
+        entries = make_entries()
+        storage.save_file(path, entries)
+
+        result = archive.archive_collection(path, archive_dir, 'rsvp',
+                                            storage.load_file, storage.save_file, max_count=3)
+        assert result['archived'] == 7
+        assert result['active'] == 3
+        assert len(storage.load_file(path)) == 3
+
+        # A second run archives nothing and leaves no empty segment
+        again = archive.archive_collection(path, archive_dir, 'rsvp',
+                                           storage.load_file, storage.save_file, max_count=3)
+        assert again['archived'] == 0
+        assert archive.archive_report(archive_dir, 'rsvp')['segments'] == 1
+
+        assert archive.load_archived(archive_dir, 'rsvp') + storage.load_file(path) == entries
+
+
+def test_archived_records_still_count():
+    """Archived RSVPs and guests stay in totals, duplicate checks and import dedupe"""
+    with temporary_sites('archived') as (client, sites):
+        tenant = sites['archived']
+        prefix = '/t/archived'
+        names = ['Alice Walker', 'Brian Cole', 'Carmen Diaz', 'Dev Patel', 'Erin Hughes',
+                 'Farid Haddad', 'Grace Kim', 'Hugo Laurent', 'Ines Moreau', 'Jack Turner']
+        storage.save_file(tenant.rsvp_file, [dict(entry, name=names[int(entry['id'])], attendance='attending')
+                                             for entry in make_entries()])
+        guests = [{'name': 'Ann Smith', 'email': 'ann@example.com'}, {'name': 'Bob Jones'}]
+        assert client.post(f'{prefix}/api/import/guests', json={'data': guests}).get_json()['imported'] == 2
+
+        for body in ({'maxAgeDays': '30'}, {'maxAgeDays': -1}, {'maxCount': 1.5}, {'maxCount': True}):
+            assert client.post(f'{prefix}/api/admin/archive', json=body).status_code == 400
+        # An age too large for a date is valid and archives nothing
+        response = client.post(f'{prefix}/api/admin/archive', json={'maxAgeDays': 1000000})
+        assert response.status_code == 200 and response.get_json()['message'] == 'Archived 0 entries'
+        response = client.post(f'{prefix}/api/admin/archive', json={'maxCount': 0})
+        assert response.status_code == 200
+        assert storage.load_file(tenant.rsvp_file) == []
+
+        stats = client.get(f'{prefix}/api/rsvp/stats').get_json()['stats']
+        assert stats['total'] == 10 and stats['attending'] == 10
+        assert client.get(f'{prefix}/api/rsvp').get_json()['archived'] == 10
+        assert client.post(f'{prefix}/api/import/guests', json={'data': guests}).get_json()['imported'] == 0
+        response = client.post(f'{prefix}/api/import/rsvp', json={'data': [{'name': 'dev patel'}, {'name': 'Kate Young'}]})
+        assert response.get_json()['imported'] == 1
+
+        # A new RSVP is reported as a duplicate of an archived one
+        storage.save_file(tenant.rsvp_file, [{'id': 'x', 'name': 'Dev Patel', 'timestamp': '2025-01-01T00:00:00'}])
+        groups = client.get(f'{prefix}/api/admin/duplicates').get_json()['duplicates']
+        assert [[record['id'] for record in group['records']] for group in groups] == [['3', 'x']]
+
+
+if __name__ == "__main__":
+    test_split_by_age_and_count()
+    test_archive_collection_round_trip()
+    test_archived_records_still_count()
+    print("✅ Archive tests passed")
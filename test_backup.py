@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for snapshot backups and point-in-time restore.
+"""
+
+import os
+import tempfile
+import threading
+
+import backup
+import storage
+from tenant_fixtures import temporary_sites
+
+
+def test_incremental_snapshot_and_restore():
+    """Unchanged files are not stored twice and restore brings back old data"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, 'data')
+        backup_dir = os.path.join(tmp_dir, 'backups')
+        os.makedirs(data_dir)
+        rsvp_file = os.path.join(data_dir, 'rsvp_data.json')
+        guestbook_file = os.path.join(data_dir, 'guestbook_data.json')
+        storage.save_file(rsvp_file, [{'id': '1', 'name': 'Test User'}])
+        storage.save_file(guestbook_file, [{'id': '1', 'name': 'Test Guest'}])
+
+        first = backup.create_snapshot(data_dir, backup_dir, [rsvp_file, guestbook_file])
+        assert first['files'] == 2
+        assert first['storedBytes'] > 0
+
+        # Only the changed file is stored by the next snapshot
+        storage.save_file(rsvp_file, [])
+        second = backup.create_snapshot(data_dir, backup_dir, [rsvp_file, guestbook_file])
+        assert len(os.listdir(os.path.join(backup_dir, 'objects'))) == 3
+
+        # Files created after the snapshot are removed on restore
+        os.makedirs(os.path.join(data_dir, 'archive'))
+        storage.save_file(os.path.join(data_dir, 'archive', 'segment.json'), [])
+
+        manifest = backup.find_snapshot(backup_dir, first['id'])
+        backup.restore_snapshot(data_dir, backup_dir, manifest, [rsvp_file, guestbook_file])
+        assert storage.load_file(rsvp_file) == [{'id': '1', 'name': 'Test User'}]
+        assert list(backup.iter_data_files(data_dir)) == ['guestbook_data.json', 'rsvp_data.json']
+
+        # A point in time resolves to the latest snapshot taken before it
+        latest = backup.list_snapshots(backup_dir)[-1]
+        assert backup.find_snapshot(backup_dir, latest['created'])['id'] == second['id']
+
+        # Timestamps with an offset, as sent by JS toISOString(), are accepted
+        assert backup.find_snapshot(backup_dir, '2099-01-01T00:00:00Z')['id'] == second['id']
+        assert backup.find_snapshot(backup_dir, '2000-01-01T00:00:00+02:00') is None
+        assert backup.find_snapshot(backup_dir, 'not a time') is None
+
+
+def test_rotation_removes_unused_objects():
+    """Rotation keeps the newest snapshots and deletes unreferenced objects"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, 'data')
+        backup_dir = os.path.join(tmp_dir, 'backups')
+        os.makedirs(data_dir)
+        rsvp_file = os.path.join(data_dir, 'rsvp_data.json')
+
+        for count in range(4):
+            storage.save_file(rsvp_file, [{'id': str(i)} for i in range(count)])
+            result = backup.create_snapshot(data_dir, backup_dir, [rsvp_file], keep=2)
+
+        assert len(result['pruned']) == 1
+        assert len(backup.list_snapshots(backup_dir)) == 2
+        assert len(os.listdir(os.path.join(backup_dir, 'objects'))) == 2
+
+
+def test_concurrent_snapshots_keep_their_objects():
+    """Snapshots taken at once never leave a manifest pointing at a deleted object"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, 'data')
+        backup_dir = os.path.join(tmp_dir, 'backups')
+        os.makedirs(data_dir)
+        rsvp_file = os.path.join(data_dir, 'rsvp_data.json')
+        storage.save_file(rsvp_file, [])
+
+        errors = []
+        def snapshot_repeatedly(offset):
+            try:
+                for i in range(15):
+                    storage.save_file(rsvp_file, [{'id': str(offset + i % 3)}])
+                    backup.create_snapshot(data_dir, backup_dir, [rsvp_file], keep=1)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=snapshot_repeatedly, args=(n * 10,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        for manifest in backup.list_snapshots(backup_dir):
+            backup.restore_snapshot(data_dir, backup_dir, manifest, [rsvp_file])
+
+
+def test_cli_restore_keeps_a_safety_snapshot():
+    """The command line restore snapshots the current state first"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = os.path.join(tmp_dir, 'data')
+        backup_dir = os.path.join(tmp_dir, 'backups')
+        os.makedirs(data_dir)
+        rsvp_file = os.path.join(data_dir, 'rsvp_data.json')
+        storage.save_file(rsvp_file, [{'id': '1', 'name': 'Test User'}])
+        assert os.path.join(data_dir, 'site_config.json') in backup.data_lock_files(data_dir)
+
+        saved_env = {name: os.environ.get(name) for name in ('DATA_DIR', 'BACKUP_DIR')}
+        os.environ.update({'DATA_DIR': data_dir, 'BACKUP_DIR': backup_dir})
+        try:
+            assert backup.main(['backup.py', 'create']) == 0
+            first = backup.list_snapshots(backup_dir)[0]['id']
+            storage.save_file(rsvp_file, [])
+            assert backup.main(['backup.py', 'restore', first]) == 0
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+        assert storage.load_file(rsvp_file) == [{'id': '1', 'name': 'Test User'}]
+        snapshots = backup.list_snapshots(backup_dir)
+        assert len(snapshots) == 2
+        assert snapshots[-1]['files']['rsvp_data.json']['size'] == len(b'[]')
+
+
+def test_restore_endpoint_accepts_utc_timestamps():
+    """The admin restore endpoint accepts "at" times ending in Z"""
+    with temporary_sites('restore') as (client, sites):
+        tenant = sites['restore']
+        storage.save_file(tenant.rsvp_file, [{'id': '1', 'name': 'Test User'}])
+        assert client.post('/t/restore/api/admin/backups').status_code == 200
+        storage.save_file(tenant.rsvp_file, [])
+
+        response = client.post('/t/restore/api/admin/backups/restore', json={'at': '2099-01-01T00:00:00Z'})
+        assert response.status_code == 200
+        assert storage.load_file(tenant.rsvp_file) == [{'id': '1', 'name': 'Test User'}]
+
+
+if __name__ == "__main__":
+    test_incremental_snapshot_and_restore()
+    test_rotation_removes_unused_objects()
+    test_concurrent_snapshots_keep_their_objects()
+    test_cli_restore_keeps_a_safety_snapshot()
+    test_restore_endpoint_accepts_utc_timestamps()
+    print("✅ Backup tests passed")
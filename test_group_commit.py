@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for group commit of concurrent submissions.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import app
+import storage
+from group_commit import GroupCommitWriter
+from tenant_fixtures import temporary_sites
+
+
+def test_concurrent_appends_are_batched():
+    """Every concurrent append is saved, using fewer writes than appends"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'rsvp_data.json')
+        storage.save_file(path, [])
+        writer = GroupCommitWriter(path, storage.load_file, storage.save_file, window=0.02)
+
+        threads = [threading.Thread(target=writer.append, args=({'id': str(i)},))
+                   for i in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        saved = storage.load_file(path)
+        assert sorted(entry['id'] for entry in saved) == sorted(str(i) for i in range(40))
+        assert writer.commits < 40
+
+
+def test_failed_commit_is_reported():
+    """A failed write raises in the caller instead of acknowledging the entry"""
+    def failing_save(filename, data):
+        raise OSError('disk full')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'rsvp_data.json')
+        storage.save_file(path, [])
+        writer = GroupCommitWriter(path, storage.load_file, failing_save, window=0)
+        try:
+            writer.append({'id': '1'})
+        except OSError:
+            pass
+        else:
+            assert False, 'failed commit was acknowledged'
+
+        # The writer recovers for the next batch
+        writer.save = storage.save_file
+        writer.append({'id': '2'})
+        assert storage.load_file(path) == [{'id': '2'}]
+
+
+def test_lone_writer_skips_the_window():
+    """With no other writer in flight an append is committed without waiting"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'rsvp_data.json')
+        storage.save_file(path, [])
+        writer = GroupCommitWriter(path, storage.load_file, storage.save_file, window=5)
+
+        start = time.time()
+        writer.append({'id': '1'})
+        assert time.time() - start < 1
+        assert storage.load_file(path) == [{'id': '1'}]
+
+
+def test_leader_returns_after_its_own_batch():
+    """The first writer of a long burst is not held until the burst ends"""
+    def slow_save(filename, data):
+        time.sleep(0.05)
+        storage.save_file(filename, data)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'rsvp_data.json')
+        storage.save_file(path, [])
+        writer = GroupCommitWriter(path, storage.load_file, slow_save, window=0)
+
+        # New guests keep arriving faster than one save completes
+        stop = threading.Event()
+        burst = []
+        def keep_arriving():
+            while not stop.is_set():
+                thread = threading.Thread(target=writer.append, args=({'id': f'burst_{len(burst)}'},))
+                thread.start()
+                burst.append(thread)
+                time.sleep(0.005)
+
+        first = threading.Thread(target=writer.append, args=({'id': 'first'},))
+        first.start()
+        arrivals = threading.Thread(target=keep_arriving)
+        arrivals.start()
+        try:
+            first.join(timeout=1)
+            assert not first.is_alive(), 'first writer was held for the whole burst'
+        finally:
+            stop.set()
+            arrivals.join()
+            for thread in burst:
+                thread.join()
+        assert any(entry['id'] == 'first' for entry in storage.load_file(path))
+
+
+def test_admin_edits_keep_concurrent_submissions():
+    """Editing RSVPs while guests submit never drops an acknowledged submission"""
+    with temporary_sites('edits') as (client, sites):
+        tenant = sites['edits']
+        storage.save_file(tenant.rsvp_file, [{'id': f'old_{i}', 'name': f'Old Guest {i}', 'attendance': 'attending',
+                                              'song': '', 'timestamp': '2025-01-01T00:00:00'}
+                                             for i in range(5000)])
+        statuses = []
+
+        def submit(i):
+            response = app.app.test_client().post('/t/edits/api/rsvp', json={'name': f'Guest {i}'})
+            statuses.append(response.status_code)
+
+        def edit():
+            client = app.app.test_client()
+            for i in range(20):
+                assert client.put('/t/edits/api/rsvp/old_0', json={'song': f'Song {i}'}).status_code == 200
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(60)]
+        threads.append(threading.Thread(target=edit))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert statuses == [200] * 60
+        names = {entry['name'] for entry in storage.load_file(tenant.rsvp_file)}
+        assert all(f'Guest {i}' in names for i in range(60))
+        assert len(names) == 5060
+
+
+if __name__ == "__main__":
+    test_concurrent_appends_are_batched()
+    test_failed_commit_is_reported()
+    test_lone_writer_skips_the_window()
+    test_leader_returns_after_its_own_batch()
+    test_admin_edits_keep_concurrent_submissions()
+    print("✅ Group commit tests passed")
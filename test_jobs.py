@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for background admin jobs.
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import jobs
+import storage
+from tenant_fixtures import temporary_sites
+
+
+def make_rsvps(count):
+    """Build RSVP records spread over the days before now"""
+    start = datetime.now() - timedelta(minutes=count)
+    return [{
+        'id': f'rsvp_{i:06d}',
+        'name': f'Guest Number {i}',
+        'attendance': 'attending' if i % 3 else 'declining',
+        'song': f'Song Request {i % 250}' if i % 2 else '',
+        'timestamp': (start + timedelta(minutes=i)).isoformat()
+    } for i in range(count)]
+
+
+def wait_for_jobs(client, prefix, job_ids, timeout=60):
+    """Poll until every job has finished, returning the final job records"""
+    deadline = time.time() + timeout
+    while True:
+        finished = {}
+        for job_id in job_ids:
+            job = client.get(f'{prefix}/api/admin/jobs/{job_id}').get_json()['job']
+            if job['status'] not in ('queued', 'running'):
+                finished[job_id] = job
+        if len(finished) == len(job_ids):
+            return finished
+        assert time.time() < deadline, 'jobs did not finish in time'
+        time.sleep(0.05)
+
+
+def test_jobs_run_while_serving_requests():
+    """Concurrent jobs on a small pool all finish while guest requests keep succeeding"""
+    jobs.shutdown()
+    jobs.configure(max_workers=2, max_pending=20)
+    with temporary_sites('load') as (client, sites):
+        tenant = sites['load']
+        try:
+            storage.save_file(tenant.rsvp_file, make_rsvps(20000))
+            prefix = '/t/load'
+
+            requests = [{'type': 'rsvp_stats'}, {'type': 'rsvp_stats'},
+                        {'type': 'export', 'collection': 'rsvp'},
+                        {'type': 'export', 'collection': 'guestbook'},
+                        {'type': 'import_guests', 'data': [{'name': f'Imported {i}'} for i in range(500)]},
+                        {'type': 'rsvp_stats'}]
+            job_ids = []
+            for body in requests:
+                response = client.post(f'{prefix}/api/admin/jobs', json=body)
+                assert response.status_code == 202
+                job_ids.append(response.get_json()['job']['id'])
+
+            # Guests keep being served while the jobs run
+            for i in range(50):
+                assert client.get(f'{prefix}/api/guestbook').status_code == 200
+                response = client.post(f'{prefix}/api/waitlist', json={'name': f'Waiting {i}'})
+                assert response.status_code == 200
+
+            finished = wait_for_jobs(client, prefix, job_ids)
+            assert all(job['status'] == 'succeeded' for job in finished.values()), finished
+            assert finished[job_ids[0]]['result']['total'] == 20000
+            assert finished[job_ids[2]]['result']['rows'] == 20000
+            assert finished[job_ids[4]]['result']['imported'] == 500
+
+            export = client.get(f'{prefix}/api/admin/jobs/{job_ids[2]}/result')
+            assert export.status_code == 200
+            assert export.data.decode().count('\n') == 20001
+            export.close()
+
+            listed = client.get(f'{prefix}/api/admin/jobs').get_json()['jobs']
+            assert [job['id'] for job in listed] == job_ids[::-1]
+            assert len(storage.load_file(tenant.waitlist_file)) == 50
+        finally:
+            jobs.shutdown()
+            jobs.configure()
+
+
+def test_queued_job_can_be_cancelled():
+    """A queued job is skipped when cancelled; a running one cannot be"""
+    jobs.shutdown()
+    jobs.configure(max_workers=1)
+    with tempfile.TemporaryDirectory() as jobs_dir:
+        try:
+            jobs.submit_job(jobs_dir, 'first', 'sleep', time.sleep, (1,))
+            jobs.submit_job(jobs_dir, 'second', 'sleep', time.sleep, (0,))
+
+            cancelled = jobs.cancel_job(jobs_dir, 'second')
+            assert cancelled['status'] == 'cancelled'
+
+            deadline = time.time() + 30
+            while jobs.get_job(jobs_dir, 'first')['status'] == 'queued':
+                assert time.time() < deadline
+                time.sleep(0.02)
+            assert jobs.cancel_job(jobs_dir, 'first')['status'] == 'running'
+            assert jobs.cancel_job(jobs_dir, 'missing') is None
+        finally:
+            jobs.shutdown()
+            jobs.configure()
+
+        assert jobs.get_job(jobs_dir, 'first')['status'] == 'succeeded'
+        second = jobs.get_job(jobs_dir, 'second')
+        assert second['status'] == 'cancelled' and 'started' not in second
+
+
+def test_pool_recovers_after_worker_dies():
+    """A job whose process dies fails, and later jobs get a fresh pool"""
+    jobs.shutdown()
+    jobs.configure(max_workers=1)
+    with tempfile.TemporaryDirectory() as jobs_dir:
+        try:
+            jobs.submit_job(jobs_dir, 'crash', 'crash', os._exit, (1,))
+            deadline = time.time() + 30
+            while jobs.get_job(jobs_dir, 'crash')['status'] in ('queued', 'running'):
+                assert time.time() < deadline, 'crashed job never failed'
+                time.sleep(0.02)
+            assert jobs.get_job(jobs_dir, 'crash')['status'] == 'failed'
+
+            jobs.submit_job(jobs_dir, 'after', 'sleep', time.sleep, (0,))
+        finally:
+            jobs.shutdown()
+            jobs.configure()
+        assert jobs.get_job(jobs_dir, 'after')['status'] == 'succeeded'
+
+
+def test_jobs_of_a_reused_pid_are_orphaned():
+    """A job whose owner PID now belongs to a different process is failed"""
+    with tempfile.TemporaryDirectory() as jobs_dir:
+        owner = {'owner': os.getpid(), 'ownerStarted': jobs._process_start_time(os.getpid())}
+        jobs._add_job(jobs_dir, {'id': 'live', 'status': 'queued', **owner})
+        jobs._add_job(jobs_dir, {'id': 'stale', 'status': 'running', **owner, 'ownerStarted': -1})
+
+        assert jobs.get_job(jobs_dir, 'live')['status'] == 'queued'
+        stale = jobs.get_job(jobs_dir, 'stale')
+        assert stale['status'] == 'failed'
+        assert stale['error'] == 'Interrupted by server restart'
+
+
+if __name__ == "__main__":
+    test_jobs_run_while_serving_requests()
+    test_queued_job_can_be_cancelled()
+    test_pool_recovers_after_worker_dies()
+    test_jobs_of_a_reused_pid_are_orphaned()
+    print("✅ Job tests passed")
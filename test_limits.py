@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for request size limits under hostile inputs.
+"""
+
+import json
+import tracemalloc
+
+import limits
+from tenant_fixtures import temporary_sites
+
+
+class EndlessBody:
+    """A request body stream that never ends, like a malicious chunked upload"""
+
+    def __init__(self):
+        self.sent = 0
+
+    def read(self, size=-1):
+        size = 64 * 1024 if size is None or size < 0 else size
+        self.sent += size
+        return b'1' * size
+
+
+def peak_memory(func):
+    """Run func and return (result, peak bytes allocated while it ran)"""
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_parse_json_rejects_during_parse():
+    """Field lengths and row counts are enforced while decoding"""
+    assert limits.parse_json(b'{"name": "Ann", "song": ""}') == {'name': 'Ann', 'song': ''}
+    rows = json.dumps({'data': [{'name': 'x'}] * 3}).encode()
+    assert limits.parse_json(rows, max_rows=3)['data'] == [{'name': 'x'}] * 3
+    for raw, kwargs, status in ((rows, {'max_rows': 2}, 413),
+                                (b'{"name": "' + b'a' * 201 + b'"}', {}, 400),
+                                (b'{"name": ', {}, 400),
+                                (b'[' * 100000, {}, 400)):
+        try:
+            limits.parse_json(raw, **kwargs)
+        except limits.PayloadRejected as e:
+            assert e.status == status
+        else:
+            assert False, f'{raw[:20]} was accepted'
+
+
+def test_oversized_bodies_are_rejected_early():
+    """Huge bodies are refused without buffering them"""
+    with temporary_sites('limits') as (client, sites):
+        prefix = '/t/limits'
+        # Refused from the Content-Length header: the body is never read
+        huge = b'{"name": "' + b'a' * (50 * 1024 * 1024) + b'"}'
+        response, peak = peak_memory(lambda: client.post(f'{prefix}/api/guestbook', data=huge,
+                                                         content_type='application/json'))
+        assert response.status_code == 413
+        assert peak < 1024 * 1024, peak
+
+        # A chunked body with no length is cut off once it passes the cap
+        body = EndlessBody()
+        response, peak = peak_memory(lambda: client.post(
+            f'{prefix}/api/rsvp', content_type='application/json',
+            environ_overrides={'wsgi.input': body, 'wsgi.input_terminated': True, 'CONTENT_LENGTH': ''}))
+        assert response.status_code == 413
+        assert body.sent <= limits.DEFAULT_MAX_BODY + limits.READ_CHUNK
+        assert peak < 4 * limits.DEFAULT_MAX_BODY, peak
+
+
+def test_field_and_row_limits():
+    """Long fields and oversized imports are refused; normal submissions still work"""
+    with temporary_sites('limits') as (client, sites):
+        prefix = '/t/limits'
+        response = client.post(f'{prefix}/api/rsvp', json={'name': 'A' * 5000, 'attendance': 'attending'})
+        assert response.status_code == 400
+        assert 'name' in response.get_json()['error']
+        response = client.post(f'{prefix}/api/guestbook', json={'name': 'Ann', 'message': 'x' * 6000})
+        assert response.status_code == 400
+        response = client.post(f'{prefix}/api/rsvp', data='{"name": ', content_type='application/json')
+        assert response.status_code == 400
+
+        # Many tiny rows fit in the byte cap but not the row limit
+        rows = json.dumps({'data': [{'name': str(i)} for i in range(100000)]}).encode()
+        assert len(rows) < limits.DEFAULT_MAX_IMPORT_BODY
+        response, peak = peak_memory(lambda: client.post(f'{prefix}/api/import/rsvp', data=rows,
+                                                         content_type='application/json'))
+        assert response.status_code == 413
+        assert peak < 3 * limits.DEFAULT_MAX_IMPORT_BODY, peak
+        assert client.get(f'{prefix}/api/rsvp').get_json()['rsvps'] == []
+
+        response = client.post(f'{prefix}/api/rsvp', json={'name': 'Ann', 'attendance': 'attending'})
+        assert response.status_code == 200
+        response = client.post(f'{prefix}/api/import/rsvp', json={'data': [{'name': 'Bob'}]})
+        assert response.get_json()['imported'] == 1
+
+
+if __name__ == "__main__":
+    test_parse_json_rejects_during_parse()
+    test_oversized_bodies_are_rejected_early()
+    test_field_and_row_limits()
+    print("✅ Request limit tests passed")
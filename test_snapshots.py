@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached site configuration and guestbook snapshots.
+"""
+
+import os
+import tempfile
+
+import storage
+from snapshots import FileSnapshot, encode_json_body
+
+
+def test_snapshot_rebuilds_only_on_change():
+    """The body is built once per file version"""
+    builds = []
+
+    def build(config):
+        builds.append(config)
+        return encode_json_body({'success': True, 'config': config})
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'site_config.json')
+        storage.save_file(path, {'showHotelInfo': True})
+        snapshot = FileSnapshot(path, storage.load_file, build)
+
+        body, etag = snapshot.get()
+        assert snapshot.get() == (body, etag)
+        assert len(builds) == 1
+
+        # A write from another worker is picked up on the next read
+        storage.save_file(path, {'showHotelInfo': False})
+        new_body, new_etag = snapshot.get()
+        assert new_etag != etag
+        assert b'"showHotelInfo":false' in new_body
+        assert len(builds) == 2
+
+
+def test_site_config_etag():
+    """GET /api/site-config answers conditional requests with 304"""
+    from app import app
+
+    client = app.test_client()
+    response = client.get('/api/site-config')
+    assert response.status_code == 200
+    assert response.get_json()['success'] is True
+
+    etag = response.headers['ETag']
+    cached = client.get('/api/site-config', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+
+def test_guestbook_view_is_bounded():
+    """The guestbook body keeps only the latest messages"""
+    from app import build_guestbook_view, GUESTBOOK_PUBLIC_LIMIT
+
+    messages = [{'name': f'Guest {i}', 'relationship': 'Friend', 'message': 'Hi', 'date': ''}
+                for i in range(GUESTBOOK_PUBLIC_LIMIT + 5)]
+
+    body = build_guestbook_view(messages)[0]
+    assert body.count(b'"relationship"') == GUESTBOOK_PUBLIC_LIMIT
+    assert b'"Guest 0"' not in body
+
+
+if __name__ == "__main__":
+    test_snapshot_rebuilds_only_on_change()
+    test_site_config_etag()
+    test_guestbook_view_is_bounded()
+    print("✅ Snapshot tests passed")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Test that importing app stays cheap: no data files and no mail modules.
+"""
+
+import os
+import subprocess
+import sys
+
+CHECK_IMPORT = """
+import sys
+import app
+assert 'smtplib' not in sys.modules, 'smtplib imported at startup'
+assert 'email.mime.multipart' not in sys.modules, 'email.mime imported at startup'
+assert 'multiprocessing' not in sys.modules, 'multiprocessing imported at startup'
+assert not app._initialized, 'data initialized at import time'
+app.create_app()
+assert app._initialized
+"""
+
+
+def test_import_is_lazy():
+    """Importing app defers mail imports and data initialization"""
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    subprocess.check_call([sys.executable, '-c', CHECK_IMPORT], cwd=project_dir)
+
+
+if __name__ == "__main__":
+    test_import_is_lazy()
+    print("✅ Startup test passed")
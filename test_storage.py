@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk data formats in storage.py.
+"""
+
+import json
+import os
+import tempfile
+
+import storage
+
+
+def test_formats_round_trip():
+    """Every available format reads back exactly what was written"""
+    records = [
+        {'id': '1', 'name': 'Test User', 'attendance': 'attending', 'song': 'Café del Mar'},
+        {'id': '2', 'name': 'Other User', 'attendance': 'declining', 'song': ''}
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'data.json')
+        for fmt in storage.available_formats():
+            storage.save_file(path, records, fmt)
+            assert storage.load_file(path) == records, fmt
+
+
+def test_legacy_indented_json_is_read():
+    """Files written by the old indent=2 save_data are still readable"""
+    config = {'showHotelInfo': True, 'hotelName': 'Test Hotel'}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'site_config.json')
+        with open(path, 'w') as f:
+            json.dump(config, f, indent=2)
+        assert storage.load_file(path) == config
+
+
+if __name__ == "__main__":
+    test_formats_round_trip()
+    test_legacy_indented_json_is_read()
+    print("✅ Storage format tests passed")
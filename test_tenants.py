@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for serving several wedding sites from one process.
+"""
+
+import os
+import tempfile
+
+import app
+from tenant_fixtures import temporary_sites
+from tenants import TenantRegistry, tenant_id_from_host
+
+
+def test_host_resolution():
+    """Tenants come from the subdomain of the base domain"""
+    assert tenant_id_from_host('smith-jones.example.com:443', 'example.com') == 'smith-jones'
+    assert tenant_id_from_host('example.org', 'example.com') is None
+    assert tenant_id_from_host('lee.localhost') == 'lee'
+    assert tenant_id_from_host('www.example.com', 'example.com') is None
+    assert tenant_id_from_host('localhost:5000') is None
+    assert tenant_id_from_host('127.0.0.1:5000') is None
+    assert tenant_id_from_host('[::1]:5000') is None
+
+
+def test_registry_evicts_least_recently_used():
+    """Only max_tenants tenants keep their caches in memory"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        registry = TenantRegistry(os.path.join(tmp_dir, 'tenants'), 'data', 'backups', max_tenants=2)
+        for tenant_id in ('a', 'b', 'c'):
+            registry.create(tenant_id)
+        registry.get('b')
+        registry.get('a')
+        assert registry.cached_tenant_ids() == ['b', 'a']
+        assert registry.get('missing') is None
+        assert registry.get('../etc') is None
+
+
+def test_path_tenants_are_isolated():
+    """Guestbook entries posted to one site are not visible on another"""
+    with temporary_sites('alpha', 'beta') as (client, sites):
+        response = client.post('/t/alpha/api/guestbook', json={
+            'name': 'Test Guest', 'relationship': 'Friend', 'message': 'Hello alpha'
+        })
+        assert response.status_code == 200
+
+        alpha = client.get('/t/alpha/api/guestbook').get_json()['messages']
+        beta = client.get('/t/beta/api/guestbook').get_json()['messages']
+        assert [m['message'] for m in alpha] == ['Hello alpha']
+        assert beta == []
+        assert client.get('/t/nobody/api/guestbook').status_code == 404
+        assert client.get('/t/alpha').status_code == 301
+
+
+def test_host_mode_site_resolution():
+    """Hosts that don't name a site get the default one; unknown sites get 404"""
+    with temporary_sites('lee', mode='host') as (client, sites):
+        app.TENANT_POLICY['baseDomain'] = None
+        app.save_data(sites['lee'].guestbook_file, [{'name': 'Test Guest', 'message': 'Hello lee'}])
+        for host in ('localhost:5000', 'www.example.com', '127.0.0.1'):
+            assert client.get('/api/health', headers={'Host': host}).status_code == 200
+        lee = client.get('/api/guestbook', headers={'Host': 'lee.localhost'}).get_json()['messages']
+        assert [m['message'] for m in lee] == ['Hello lee']
+
+        app.TENANT_POLICY['baseDomain'] = 'weddings.example.com'
+        for host in ('weddings.example.com', 'www.weddings.example.com'):
+            assert client.get('/api/health', headers={'Host': host}).status_code == 200
+        # A misspelled or deleted site must not reach the default site's data
+        assert client.get('/api/rsvp/stats', headers={'Host': 'lea.weddings.example.com'}).status_code == 404
+        response = client.post('/api/guestbook', headers={'Host': 'lea.weddings.example.com'}, json={
+            'name': 'Test Guest', 'relationship': 'Friend', 'message': 'Misdirected'
+        })
+        assert response.status_code == 404
+
+
+if __name__ == "__main__":
+    test_host_resolution()
+    test_registry_evicts_least_recently_used()
+    test_path_tenants_are_isolated()
+    test_host_mode_site_resolution()
+    print("✅ Tenant tests passed")
@@ -2,9 +2,12 @@
 """
 WSGI entry point for the wedding website backend.
 This file is used by production WSGI servers like Gunicorn or uWSGI.
+Run gunicorn with --preload so create_app() runs once in the master.
 """
 
-from app import app
+from app import create_app
+
+app = create_app()
 
 if __name__ == "__main__":
     app.run() 
\ No newline at end of file